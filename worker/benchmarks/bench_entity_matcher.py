@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+placeholder.apply_placeholders 벤치마크 (고유명사 10 / 1k / 10k개)
+
+  - legacy: 이름마다 정규식 컴파일 + search + sub (이전 구현, 비교용 재현)
+  - compiled: 스냅샷당 1회 컴파일한 trie 정규식으로 1회 스캔 (현재 구현)
+
+문단마다 치환한 뒤 placeholder를 원래 이름으로 되돌린 결과가
+두 구현에서 같은지도 확인한다. 네트워크 / LLM 호출 없음.
+
+사용 예:
+  python benchmarks/bench_entity_matcher.py
+  python benchmarks/bench_entity_matcher.py --sizes 10,1000,10000 --paragraphs 200
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import uuid
+
+WORKER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, WORKER_DIR)
+
+from translation_core.placeholder import PLACEHOLDER_RE, EntityMatcher, apply_placeholders  # noqa: E402
+
+# legacy uuid 토큰 + 현재 토큰
+_TOKEN_RE = re.compile(rf"__ENTITY_[0-9a-f]+__|{PLACEHOLDER_RE.pattern}")
+
+FILLER = [
+    "그는 천천히 고개를 들었다.",
+    "\"정말 그렇게 생각해?\"",
+    "바람이 멎자 주위가 조용해졌다.",
+    "[시스템 알림: 퀘스트가 갱신되었습니다.]",
+    "누구도 대답하지 않았다.",
+]
+
+
+def legacy_apply_placeholders(text: str, entities: dict):
+    mapping = {}
+    for name in sorted(entities.keys(), key=len, reverse=True):
+        token = f"__ENTITY_{uuid.uuid4().hex}__"
+        pattern = re.compile(rf'(?<!\w){re.escape(name)}(?!\w)')
+        if pattern.search(text):
+            text = pattern.sub(token, text)
+            mapping[token] = name
+    return text, mapping
+
+
+def make_names(count: int, rng: random.Random) -> list:
+    names = set()
+    while len(names) < count:
+        if rng.random() < 0.8:
+            # 한글 이름 2~4자
+            names.add("".join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(2, 4))))
+        else:
+            # 영문 / 공백 포함 이름
+            words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8)))
+                     for _ in range(rng.randint(1, 2))]
+            names.add(" ".join(w.capitalize() for w in words))
+    return sorted(names)
+
+
+def make_paragraphs(names: list, count: int, rng: random.Random) -> list:
+    paragraphs = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(3, 8)):
+            parts.append(rng.choice(FILLER))
+            if rng.random() < 0.5:
+                parts.append(f"{rng.choice(names)} 역시 그 자리에 있었다.")
+        paragraphs.append(" ".join(parts))
+    return paragraphs
+
+
+def _normalized(text: str, mapping: dict) -> str:
+    return _TOKEN_RE.sub(lambda m: f"<{mapping[m.group(0)]}>", text)
+
+
+def bench_size(size: int, paragraph_count: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    names = make_names(size, rng)
+    entities = {name: name.upper() for name in names}
+    paragraphs = make_paragraphs(names, paragraph_count, rng)
+
+    start = time.perf_counter()
+    legacy = [legacy_apply_placeholders(p, entities) for p in paragraphs]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    EntityMatcher(entities.keys())
+    compile_s = time.perf_counter() - start
+
+    apply_placeholders("", entities)  # 스냅샷 matcher 준비 (이후 문단은 재사용)
+    start = time.perf_counter()
+    compiled = [apply_placeholders(p, entities) for p in paragraphs]
+    compiled_s = time.perf_counter() - start
+
+    mismatches = sum(
+        _normalized(*a) != _normalized(*b)
+        for a, b in zip(legacy, compiled)
+    )
+
+    return {
+        "names": size,
+        "paragraphs": paragraph_count,
+        "legacy_ms_per_paragraph": legacy_s * 1000 / paragraph_count,
+        "compile_ms": compile_s * 1000,
+        "compiled_ms_per_paragraph": compiled_s * 1000 / paragraph_count,
+        "speedup": legacy_s / compiled_s if compiled_s else float("inf"),
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entity placeholder matching")
+    parser.add_argument("--sizes", default="10,1000,10000", help="Comma-separated glossary sizes")
+    parser.add_argument("--paragraphs", type=int, default=50, help="Paragraphs per size (default: 50)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'names':>7} {'legacy ms/para':>15} {'compile ms':>11} {'compiled ms/para':>17} {'speedup':>8} {'mismatch':>9}")
+    failed = False
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        r = bench_size(size, args.paragraphs, args.seed)
+        failed |= r["mismatches"] > 0
+        print(
+            f"{r['names']:>7} {r['legacy_ms_per_paragraph']:>15.3f} {r['compile_ms']:>11.1f} "
+            f"{r['compiled_ms_per_paragraph']:>17.3f} {r['speedup']:>7.1f}x {r['mismatches']:>9}"
+        )
+
+    if failed:
+        print("❌ Compiled matcher output differs from legacy implementation")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+고유명사 로드 벤치마크: Storage JSON vs entity_pack 바이너리 스냅샷 (고유명사 10 / 1k / 10k개)
+
+  - json: JSON 파싱 → 대상 언어 필터링 → matcher trie 생성 (entity_pack 이전, 프로세스마다 반복)
+  - pack: mmap으로 열기 → 저장된 trie 읽기 (파일은 스냅샷 버전당 1회 생성)
+  - compile: 두 경우 모두 프로세스마다 1회 남는 정규식 컴파일 비용 (참고용)
+
+두 경로로 만든 matcher의 placeholder 치환 결과와 번역 조회 결과가 같은지도 확인한다.
+새 프로세스 기준 비용을 재기 위해 size마다 matcher 캐시를 거치지 않고 직접 만든다.
+네트워크 / LLM 호출 없음.
+
+사용 예:
+  python benchmarks/bench_entity_pack.py
+  python benchmarks/bench_entity_pack.py --sizes 10,1000,10000,50000 --paragraphs 200
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+WORKER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, WORKER_DIR)
+
+from bench_entity_matcher import make_names, make_paragraphs  # noqa: E402
+from translation_core import entity_pack  # noqa: E402
+from translation_core.entity_store import _parse_entities, filter_entities  # noqa: E402
+from translation_core.placeholder import EntityMatcher, matcher_tables  # noqa: E402
+
+TARGET = "en"
+
+
+def make_body(names: list) -> str:
+    """
+    Storage 응답 모양의 JSON 본문 (일부는 잠기지 않았거나 대상 언어 번역 없음)
+    """
+    return json.dumps({
+        "entities": [
+            {
+                "source_text": name,
+                "locked": i % 10 != 0,
+                "translations": {TARGET: name.upper(), "ja": name} if i % 7 else {"ja": name},
+            }
+            for i, name in enumerate(names)
+        ]
+    }, ensure_ascii=False)
+
+
+def bench_size(size: int, paragraph_count: int, seed: int, directory: str) -> dict:
+    rng = random.Random(seed)
+    names = make_names(size, rng)
+    body = make_body(names)
+    paragraphs = make_paragraphs(names, paragraph_count, rng)
+
+    start = time.perf_counter()
+    entities = filter_entities(_parse_entities(body), TARGET)
+    tables = matcher_tables(entities)
+    json_s = time.perf_counter() - start
+
+    path = os.path.join(directory, f"bench-{size}.nrep")
+    start = time.perf_counter()
+    entity_pack.build(path, "v1", entities, tables)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    packed = entity_pack.open_pack(path, "v1")
+    packed_tables = packed.matcher_tables()
+    pack_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from_json = EntityMatcher(entities, "ko", tables)
+    compile_s = time.perf_counter() - start
+    from_pack = EntityMatcher(packed, "ko", packed_tables)
+
+    mismatches = sum(from_json.apply(p) != from_pack.apply(p) for p in paragraphs)
+    mismatches += sum(packed.get(name) != entities.get(name) for name in names)
+    mismatches += len(packed) != len(entities)
+
+    return {
+        "names": size,
+        "json_ms": json_s * 1000,
+        "pack_ms": pack_s * 1000,
+        "build_ms": build_s * 1000,
+        "compile_ms": compile_s * 1000,
+        "file_kb": os.path.getsize(path) / 1024,
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entity snapshot loading (JSON vs entity_pack)")
+    parser.add_argument("--sizes", default="10,1000,10000", help="Comma-separated glossary sizes")
+    parser.add_argument("--paragraphs", type=int, default=50, help="Paragraphs checked per size (default: 50)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'names':>7} {'json ms':>9} {'pack ms':>9} {'build ms':>9} {'compile ms':>11} {'file KB':>9} {'mismatch':>9}")
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+            r = bench_size(size, args.paragraphs, args.seed, directory)
+            failed |= r["mismatches"] > 0
+            print(
+                f"{r['names']:>7} {r['json_ms']:>9.2f} {r['pack_ms']:>9.2f} {r['build_ms']:>9.2f} "
+                f"{r['compile_ms']:>11.1f} {r['file_kb']:>9.1f} {r['mismatches']:>9}"
+            )
+
+    if failed:
+        print("❌ entity_pack results differ from the JSON path")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
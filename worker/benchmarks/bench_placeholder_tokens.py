@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+placeholder 토큰 비용 리포트 (__ENTITY_<uuid>__ → __E1__)
+
+  - placeholder 1개당 토큰 수 (기존 uuid 방식 / 현재 방식)
+  - 문단 전체 토큰 수와 3단계 파이프라인 기준 절감량
+    (placeholder가 들어간 본문은 번역/편집/고급 편집 각 단계의 입력과 출력에 1번씩, 총 6회 등장)
+  - 같은 문단을 두 번 치환했을 때 결과가 같은지 (캐시 키 안정성)
+
+토큰 수는 tiktoken(o200k_base)이 있으면 실제 BPE 기준,
+없으면 token_budget.estimate_tokens 추정치로 계산한다. 네트워크 / LLM 호출 없음.
+
+사용 예:
+  python benchmarks/bench_placeholder_tokens.py
+  python benchmarks/bench_placeholder_tokens.py --names 1000 --paragraphs 500 --max-token-cost 6
+"""
+
+import argparse
+import os
+import random
+import sys
+
+WORKER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, WORKER_DIR)
+
+from bench_entity_matcher import legacy_apply_placeholders, make_names, make_paragraphs  # noqa: E402
+from translation_core.placeholder import PLACEHOLDER_RE, apply_placeholders  # noqa: E402
+from translation_core.token_budget import estimate_tokens  # noqa: E402
+
+# 본문이 파이프라인에서 토큰으로 청구되는 횟수 (3단계 × 입력/출력)
+STAGE_APPEARANCES = 6
+
+
+def token_counter():
+    """
+    (이름, 텍스트 → 토큰 수) - tiktoken 인코딩을 못 쓰면 추정치
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return "tiktoken o200k_base", lambda text: len(encoding.encode(text))
+    except Exception:
+        return "estimate_tokens (tiktoken unavailable)", estimate_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report placeholder token savings")
+    parser.add_argument("--names", type=int, default=500, help="Glossary size (default: 500)")
+    parser.add_argument("--paragraphs", type=int, default=200, help="Sample paragraphs (default: 200)")
+    parser.add_argument("--max-token-cost", type=int, default=6,
+                        help="Fail if any current placeholder costs more tokens than this (default: 6)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    counter_name, count = token_counter()
+    rng = random.Random(args.seed)
+    names = make_names(args.names, rng)
+    entities = {name: name.upper() for name in names}
+    paragraphs = make_paragraphs(names, args.paragraphs, rng)
+
+    legacy_tokens = []
+    current_tokens = []
+    legacy_total = 0
+    current_total = 0
+    unstable = 0
+    malformed = 0
+
+    for para in paragraphs:
+        legacy_text, legacy_mapping = legacy_apply_placeholders(para, entities)
+        current_text, current_mapping = apply_placeholders(para, entities)
+        if apply_placeholders(para, entities) != (current_text, current_mapping):
+            unstable += 1
+        # 검증/복원 정규식이 인식하는 모양인지
+        malformed += sum(not PLACEHOLDER_RE.fullmatch(token) for token in current_mapping)
+
+        legacy_tokens += [count(token) for token in legacy_mapping]
+        current_tokens += [count(token) for token in current_mapping]
+        legacy_total += count(legacy_text)
+        current_total += count(current_text)
+
+    placeholders = len(current_tokens)
+    saved = legacy_total - current_total
+    worst = max(current_tokens, default=0)
+
+    print(f"Token counter: {counter_name}")
+    print(f"Paragraphs: {len(paragraphs)}, placeholders: {placeholders}")
+    if placeholders:
+        print(f"Tokens per placeholder: legacy {sum(legacy_tokens) / len(legacy_tokens):.1f}, "
+              f"current {sum(current_tokens) / placeholders:.1f} (max {worst})")
+    print(f"Paragraph tokens: legacy {legacy_total}, current {current_total} "
+          f"({saved / max(legacy_total, 1):.1%} fewer)")
+    print(f"Saved per pipeline run (x{STAGE_APPEARANCES} stage appearances): {saved * STAGE_APPEARANCES} tokens "
+          f"({saved * STAGE_APPEARANCES / len(paragraphs):.1f} per paragraph)")
+    print(f"Deterministic: {'yes' if not unstable else f'no ({unstable} paragraphs differ)'}")
+
+    if worst > args.max_token_cost or unstable or malformed:
+        print("❌ Placeholder tokens are not cheap/deterministic enough")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
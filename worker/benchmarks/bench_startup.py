@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+translate_cli.py cold start 벤치마크
+
+모드별(restructure / translate / serve)로
+  1) python -X importtime 기반 import 비용 상위 모듈 리포트
+  2) 프로세스 시작 → 종료(serve는 ready 프레임)까지 wall-clock 측정
+을 수행한다. LLM / Storage 호출은 발생하지 않는다 (빈 입력 사용).
+
+사용 예:
+  python benchmarks/bench_startup.py
+  python benchmarks/bench_startup.py --runs 10 --save baseline.json
+  python benchmarks/bench_startup.py --baseline baseline.json --max-regression 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+WORKER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI_PATH = os.path.join(WORKER_DIR, "translate_cli.py")
+
+# 모드별 실행 인자 (빈 텍스트 → 네트워크 호출 없이 종료)
+MODES = {
+    "restructure": ["--mode", "restructure", "--text", "", "--target", "en"],
+    "translate": ["--mode", "translate", "--title", "bench", "--text", "", "--target", "en"],
+    "serve": ["--mode", "serve"],
+}
+
+
+def _run_once(mode: str, importtime: bool = False):
+    """
+    1회 실행 → (wall-clock 초, stderr)
+    serve 모드는 ready 프레임 수신 시점까지 측정 후 stdin을 닫아 종료
+    """
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += [CLI_PATH] + MODES[mode]
+
+    start = time.perf_counter()
+
+    if mode == "serve":
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        proc.stdout.readline()  # {"event": "ready"}
+        elapsed = time.perf_counter() - start
+        _, stderr = proc.communicate(input="")  # stdin EOF → 종료
+        return elapsed, stderr
+
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode} exited with {proc.returncode}: {proc.stderr[-500:]}")
+    return elapsed, proc.stderr
+
+
+def parse_importtime(stderr: str, top: int = 15) -> list:
+    """
+    -X importtime 출력에서 누적 시간 상위 top-level 패키지 추출
+    반환: [(module, cumulative_us), ...]
+    """
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        _, cumulative_us, name = parts
+        if not cumulative_us.strip().isdigit():
+            continue  # 헤더 줄
+        name = name[1:]
+        if name.startswith(" "):
+            continue  # 중첩 import (들여쓰기)
+        totals[name] = max(totals.get(name, 0), int(cumulative_us))
+
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:top]
+
+
+def bench(runs: int) -> dict:
+    report = {}
+    for mode in MODES:
+        # 1회 워밍업 (.pyc 생성)
+        _run_once(mode)
+        samples = [_run_once(mode)[0] for _ in range(runs)]
+        _, stderr = _run_once(mode, importtime=True)
+
+        report[mode] = {
+            "runs": runs,
+            "median_ms": round(statistics.median(samples) * 1000, 1),
+            "min_ms": round(min(samples) * 1000, 1),
+            "max_ms": round(max(samples) * 1000, 1),
+            "top_imports_ms": [
+                [module, round(us / 1000, 1)] for module, us in parse_importtime(stderr)
+            ],
+        }
+    return report
+
+
+def print_report(report: dict):
+    for mode, r in report.items():
+        print(f"=== {mode}: median {r['median_ms']}ms (min {r['min_ms']} / max {r['max_ms']}, n={r['runs']})")
+        for module, ms in r["top_imports_ms"]:
+            print(f"    {ms:>8.1f}ms  {module}")
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list:
+    """
+    baseline 대비 median이 max_regression(%) 이상 느려진 모드 목록
+    """
+    regressions = []
+    for mode, r in report.items():
+        base = baseline.get(mode)
+        if not base:
+            continue
+        limit = base["median_ms"] * (1 + max_regression / 100)
+        if r["median_ms"] > limit:
+            regressions.append(f"{mode}: {r['median_ms']}ms > {limit:.1f}ms (baseline {base['median_ms']}ms)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark translate_cli.py cold start per mode")
+    parser.add_argument("--runs", type=int, default=5, help="Wall-clock samples per mode (default: 5)")
+    parser.add_argument("--save", help="Write the report as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a previously saved report")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="Allowed median slowdown vs baseline in percent (default: 20)")
+    args = parser.parse_args()
+
+    report = bench(args.runs)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.max_regression)
+        if regressions:
+            print("❌ Cold start regression:")
+            for line in regressions:
+                print(f"    {line}")
+            sys.exit(1)
+        print("✅ No cold start regression")
+
+
+if __name__ == "__main__":
+    main()
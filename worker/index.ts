@@ -9,7 +9,7 @@
 
 import db, { initDb } from '../app/db.js';
 import { splitIntoChunks } from './chunker.js';
-import { translateWithPython, restructureParagraphsWithPython } from './translate.js';
+import { translateWithPython, restructureParagraphsWithPython, finishJobInPython } from './translate.js';
 import { runCommentBotIntl } from '../app/api/dev/run-comment-bot-intl/engine.js';
 import { runKoreanCommentBot } from '../app/api/dev/run-comment-bot/ko-engine.js';
 import type { LanguagePack } from '../app/api/dev/run-comment-bot-intl/types.js';
@@ -36,6 +36,9 @@ async function loadLangPack(lang: string): Promise<LanguagePack> {
 // 같은 에피소드 내 동시 번역 수 (burst 방지를 위해 3개 제한)
 const MAX_CONCURRENCY = 3;
 
+// 한 작업 안에서 동시에 번역할 청크 수 (다음 청크 번역이 앞 청크를 기다리지 않도록)
+const CHUNK_CONCURRENCY = 2;
+
 interface TranslationJob {
   id: string;
   episode_id: string;
@@ -140,19 +143,27 @@ async function translateChunk(
   language: string,
   novelId: string,
   chunkIndex: number,
-  sourceLanguage: string
+  sourceLanguage: string,
+  jobId: string,
+  isCancelled: () => boolean = () => false
 ): Promise<string> {
   const MAX_RETRIES = 3;
   let lastError: Error | null = null;
 
   for (let attempt = 0; attempt < MAX_RETRIES; attempt++) {
+    if (attempt > 0 && isCancelled()) {
+      // Another chunk of the same job already failed: don't spend more calls on it
+      break;
+    }
     try {
       // Call Python translation pipeline directly (no HTTP)
       const translatedText = await translateWithPython({
         novelTitle: novelId,
         text: chunkText,
         sourceLanguage: sourceLanguage,
-        targetLanguage: language
+        targetLanguage: language,
+        // Completed paragraphs are checkpointed, so a retry resumes instead of starting over
+        jobId: `${jobId}:${chunkIndex}`
       });
 
       return translatedText;
@@ -594,12 +605,34 @@ async function processJob(job: TranslationJob): Promise<void> {
     const chunks = splitIntoChunks(content, 2500);
     console.log(`[Worker] 📦 Split into ${chunks.length} chunks`);
 
-    // 2. Translate each chunk sequentially (preserves context)
-    const translatedChunks: string[] = [];
-    for (const chunk of chunks) {
-      console.log(`[Worker] 🔄 Translating chunk ${chunk.index + 1}/${chunks.length} (${chunk.charCount} chars)...`);
-      const result = await translateChunk(chunk.text, language, novel_id, chunk.index, source_language);
-      translatedChunks.push(result);
+    // 2. Translate chunks with bounded overlap (results kept in original order)
+    //    Chunks are translated independently, so chunk N+1 does not need to wait for chunk N.
+    //    Once a chunk fails the job is FAILED: the other runners stop picking up chunks (and retrying),
+    //    and the first error is rethrown only after every in-flight chunk has settled.
+    const translatedChunks: string[] = new Array(chunks.length);
+    let nextChunk = 0;
+    let failed = false;
+    let firstError: unknown = null;
+    const runners = Array.from({ length: Math.min(CHUNK_CONCURRENCY, chunks.length) }, async () => {
+      while (!failed && nextChunk < chunks.length) {
+        const chunk = chunks[nextChunk++];
+        console.log(`[Worker] 🔄 Translating chunk ${chunk.index + 1}/${chunks.length} (${chunk.charCount} chars)...`);
+        try {
+          translatedChunks[chunk.index] = await translateChunk(
+            chunk.text, language, novel_id, chunk.index, source_language, id, () => failed
+          );
+        } catch (error) {
+          if (!failed) {
+            failed = true;
+            firstError = error;
+          }
+          return;
+        }
+      }
+    });
+    await Promise.allSettled(runners);
+    if (failed) {
+      throw firstError;
     }
 
     // 3. Merge results (preserves original structure)
@@ -620,6 +653,13 @@ async function processJob(job: TranslationJob): Promise<void> {
       [finalText, id]
     );
 
+    // 6. Drop paragraph checkpoints and entity pins (a requeued job must not resume this attempt)
+    try {
+      await finishJobInPython(id);
+    } catch (error: any) {
+      console.warn(`[Worker] ⚠️  Failed to finish job ${id} in Python: ${error.message}`);
+    }
+
     console.log(`[Worker] ✅ ${language} completed for ${novel_id}/${episode_id}`);
 
   } catch (error: any) {
@@ -632,7 +672,7 @@ async function processJob(job: TranslationJob): Promise<void> {
       errorType = 'INVALID_CONTENT';
     }
 
-    // 6. Mark as FAILED + error_type
+    // 7. Mark as FAILED + error_type
     await db.query(
       `UPDATE episode_translations 
        SET status = 'FAILED', 
@@ -1,80 +1,194 @@
 /**
  * TypeScript-Python Bridge for Translation
- * 
+ *
  * Calls Python translation_core pipeline from Node.js Worker
+ *
+ * A single long-lived `translate_cli.py --mode serve` process is kept per
+ * Worker so the OpenAI client, its HTTP connection pool and entity data stay
+ * warm between chunks. Requests/responses are JSON Lines over stdin/stdout.
  */
 
-import { spawn } from 'child_process';
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
 import * as path from 'path';
+import * as readline from 'readline';
 
 export interface TranslateOptions {
     novelTitle: string;
     text: string;
     sourceLanguage?: string;
     targetLanguage: string;
+    jobId?: string;  // Paragraph checkpoint key: a retried job resumes where it stopped
+}
+
+interface ServeRequest {
+    mode: 'translate' | 'restructure' | 'finish';
+    title?: string;
+    text?: string;
+    source?: string;
+    target?: string;
+    job?: string;
+}
+
+interface ServeResponse {
+    id: number | null;
+    ok?: boolean;
+    result?: string;
+    error?: string;
+    event?: string;
+}
+
+interface PendingRequest {
+    resolve: (result: string) => void;
+    reject: (error: Error) => void;
 }
 
 /**
- * Translate text using Python translation_core pipeline
- * 
- * @param options Translation options
- * @returns Translated text
+ * Persistent Python worker (translate_cli.py --mode serve)
+ *
+ * Spawned lazily on first request and respawned if it exits.
  */
-export async function translateWithPython(options: TranslateOptions): Promise<string> {
-    const {
-        novelTitle,
-        text,
-        sourceLanguage = 'ko',
-        targetLanguage
-    } = options;
+class PythonServeProcess {
+    private python: ChildProcessWithoutNullStreams | null = null;
+    private pending = new Map<number, PendingRequest>();
+    private nextId = 1;
 
-    return new Promise((resolve, reject) => {
+    private start(): ChildProcessWithoutNullStreams {
         const scriptPath = path.join(__dirname, 'translate_cli.py');
 
-        const python = spawn('python', [
-            scriptPath,
-            '--title', novelTitle,
-            '--text', text,
-            '--source', sourceLanguage,
-            '--target', targetLanguage
-        ], {
+        const python = spawn('python', [scriptPath, '--mode', 'serve'], {
             env: {
                 ...process.env,
                 PYTHONUNBUFFERED: '1'  // Disable Python output buffering
             }
         });
 
-        let stdout = '';
-        let stderr = '';
-
-        python.stdout.on('data', (data) => {
-            stdout += data.toString();
-        });
+        const lines = readline.createInterface({ input: python.stdout });
+        lines.on('line', (line) => this.handleLine(line));
 
         python.stderr.on('data', (data) => {
-            stderr += data.toString();
+            // Log Python stderr to Worker console
+            const message = data.toString().trim();
+            if (message) {
+                console.log(message);
+            }
         });
 
-        python.on('close', (code) => {
-            if (code !== 0) {
-                reject(new Error(`Python translation failed (exit code ${code}): ${stderr}`));
-            } else {
-                resolve(stdout);
+        python.on('exit', (code) => {
+            if (this.python === python) {
+                this.python = null;
             }
+            this.failAll(new Error(`Python serve process exited (exit code ${code})`));
         });
 
         python.on('error', (err) => {
-            reject(new Error(`Failed to spawn Python process: ${err.message}`));
+            if (this.python === python) {
+                this.python = null;
+            }
+            this.failAll(new Error(`Failed to spawn Python process: ${err.message}`));
+        });
+
+        // EPIPE etc. when the process dies mid-write: without a listener Node crashes the Worker
+        python.stdin.on('error', (err) => {
+            if (this.python === python) {
+                this.python = null;
+            }
+            this.failAll(new Error(`Python stdin error: ${err.message}`));
+        });
+
+        return python;
+    }
+
+    private handleLine(line: string) {
+        if (!line.trim()) {
+            return;
+        }
+
+        let response: ServeResponse;
+        try {
+            response = JSON.parse(line);
+        } catch {
+            console.log(`[Python] Ignoring non-protocol output: ${line.slice(0, 200)}`);
+            return;
+        }
+
+        if (response.event || response.id === null) {
+            if (response.error) {
+                console.log(`[Python] ${response.error}`);
+            }
+            return;
+        }
+
+        const pending = this.pending.get(response.id);
+        if (!pending) {
+            return;
+        }
+        this.pending.delete(response.id);
+
+        if (response.ok) {
+            pending.resolve(response.result ?? '');
+        } else {
+            pending.reject(new Error(`Python translation failed: ${response.error}`));
+        }
+    }
+
+    private failAll(error: Error) {
+        for (const pending of this.pending.values()) {
+            pending.reject(error);
+        }
+        this.pending.clear();
+    }
+
+    request(payload: ServeRequest): Promise<string> {
+        if (!this.python) {
+            this.python = this.start();
+        }
+        const python = this.python;
+        const id = this.nextId++;
+
+        return new Promise((resolve, reject) => {
+            this.pending.set(id, { resolve, reject });
+            python.stdin.write(JSON.stringify({ id, ...payload }) + '\n', (err) => {
+                if (err && this.pending.delete(id)) {
+                    reject(new Error(`Failed to write to Python process: ${err.message}`));
+                }
+            });
         });
+    }
+}
+
+const serveProcess = new PythonServeProcess();
+
+/**
+ * Translate text using Python translation_core pipeline
+ *
+ * @param options Translation options
+ * @returns Translated text
+ */
+export async function translateWithPython(options: TranslateOptions): Promise<string> {
+    const {
+        novelTitle,
+        text,
+        sourceLanguage = 'ko',
+        targetLanguage,
+        jobId
+    } = options;
+
+    return serveProcess.request({
+        mode: 'translate',
+        title: novelTitle,
+        text,
+        source: sourceLanguage,
+        target: targetLanguage,
+        job: jobId
     });
 }
 
 /**
  * Restructure paragraphs using Python paragraph editors
- * 
+ *
  * This is called AFTER chunk merging to apply language-specific
  * paragraph rhythm adjustments to the full translated text.
- * 
+ *
  * @param text Merged translated text
  * @param targetLanguage Target language code
  * @returns Text with restructured paragraphs
@@ -83,46 +197,25 @@ export async function restructureParagraphsWithPython(
     text: string,
     targetLanguage: string
 ): Promise<string> {
-    return new Promise((resolve, reject) => {
-        const scriptPath = path.join(__dirname, 'translate_cli.py');
-
-        const python = spawn('python', [
-            scriptPath,
-            '--mode', 'restructure',
-            '--text', text,
-            '--target', targetLanguage
-        ], {
-            env: {
-                ...process.env,
-                PYTHONUNBUFFERED: '1'
-            }
-        });
-
-        let stdout = '';
-        let stderr = '';
-
-        python.stdout.on('data', (data) => {
-            stdout += data.toString();
-        });
-
-        python.stderr.on('data', (data) => {
-            stderr += data.toString();
-            // Log Python stderr to Worker console
-            if (stderr.trim()) {
-                console.log(stderr.trim());
-            }
-        });
-
-        python.on('close', (code) => {
-            if (code !== 0) {
-                reject(new Error(`Paragraph restructuring failed (exit code ${code}): ${stderr}`));
-            } else {
-                resolve(stdout);
-            }
-        });
+    return serveProcess.request({
+        mode: 'restructure',
+        text,
+        target: targetLanguage
+    });
+}
 
-        python.on('error', (err) => {
-            reject(new Error(`Failed to spawn Python process: ${err.message}`));
-        });
+/**
+ * Drop a finished job's paragraph checkpoints and entity snapshot pins
+ *
+ * Called once the job is DONE, so re-translating the same job starts fresh
+ * with current entities instead of resuming; only crashed or failed attempts
+ * keep their checkpoints.
+ *
+ * @param jobId Job ID passed to translateWithPython (without chunk index)
+ */
+export async function finishJobInPython(jobId: string): Promise<void> {
+    await serveProcess.request({
+        mode: 'finish',
+        job: jobId
     });
 }
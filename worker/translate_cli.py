@@ -7,20 +7,26 @@ Allows TypeScript Worker to call Python translation logic
 import sys
 import argparse
 import os
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add parent directory to path to import translation_core
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from translation_core.pipeline import translate_text
-from translation_core.paragraph_editor_ko import restructure_paragraphs_ko
-from translation_core.paragraph_editor_en import restructure_paragraphs_en
-from translation_core.paragraph_editor_ja import restructure_paragraphs_ja
-from translation_core.paragraph_editor_zh import restructure_paragraphs_zh
-from translation_core.paragraph_editor_es import restructure_paragraphs_es
-from translation_core.paragraph_editor_fr import restructure_paragraphs_fr
-from translation_core.paragraph_editor_de import restructure_paragraphs_de
-from translation_core.paragraph_editor_pt import restructure_paragraphs_pt
-from translation_core.paragraph_editor_id import restructure_paragraphs_id
+# 🔗 문단 에디터는 대상 언어만 지연 import
+# (translation_core.pipeline은 translate 요청 시점에 import)
+from translation_core.paragraph_editors import get_paragraph_editor
+
+# serve 모드에서 동시에 처리할 요청 수 (Worker MAX_CONCURRENCY × CHUNK_CONCURRENCY와 맞춤)
+SERVE_MAX_WORKERS = int(os.getenv("TRANSLATE_SERVE_WORKERS", "6"))
+
+# batch 모드 기본 동시 처리 수
+BATCH_MAX_WORKERS = int(os.getenv("TRANSLATE_BATCH_WORKERS", "4"))
+
+# 대용량 입출력 스트리밍 단위 (문자 수)
+IO_CHUNK_SIZE = 64 * 1024
 
 def restructure_paragraphs_only(text: str, target_language: str) -> str:
     """
@@ -29,24 +35,9 @@ def restructure_paragraphs_only(text: str, target_language: str) -> str:
     """
     print(f"[Python] Starting paragraph restructuring for {target_language}...", file=sys.stderr)
     
-    if target_language == "ko":
-        result = restructure_paragraphs_ko(text)
-    elif target_language == "en":
-        result = restructure_paragraphs_en(text)
-    elif target_language == "ja":
-        result = restructure_paragraphs_ja(text)
-    elif target_language == "zh":
-        result = restructure_paragraphs_zh(text)
-    elif target_language == "es":
-        result = restructure_paragraphs_es(text)
-    elif target_language == "fr":
-        result = restructure_paragraphs_fr(text)
-    elif target_language == "de":
-        result = restructure_paragraphs_de(text)
-    elif target_language == "pt":
-        result = restructure_paragraphs_pt(text)
-    elif target_language == "id":
-        result = restructure_paragraphs_id(text)
+    editor = get_paragraph_editor(target_language)
+    if editor is not None:
+        result = editor(text)
     else:
         print(f"[Python] No paragraph editor for {target_language}, returning original", file=sys.stderr)
         result = text
@@ -54,36 +45,405 @@ def restructure_paragraphs_only(text: str, target_language: str) -> str:
     print(f"[Python] Paragraph restructuring complete", file=sys.stderr)
     return result
 
+def read_stream(stream) -> str:
+    """
+    텍스트 스트림을 IO_CHUNK_SIZE 단위로 읽어 하나의 문자열로 합침
+    (argv 복사 없이 대용량 에피소드 입력)
+    """
+    parts = []
+    while True:
+        chunk = stream.read(IO_CHUNK_SIZE)
+        if not chunk:
+            break
+        parts.append(chunk)
+    return "".join(parts)
+
+def write_stream(stream, text: str):
+    """
+    결과를 IO_CHUNK_SIZE 단위로 나눠 기록
+    """
+    for i in range(0, len(text), IO_CHUNK_SIZE):
+        stream.write(text[i:i + IO_CHUNK_SIZE])
+    stream.flush()
+
+def read_input(args) -> str:
+    """
+    입력 경로 선택: --text / --text-file / --text-stdin / --input-fd
+    모두 UTF-8로 디코딩
+    """
+    if args.text is not None:
+        return args.text
+
+    if args.text_file:
+        with open(args.text_file, "r", encoding="utf-8") as f:
+            return read_stream(f)
+
+    if args.text_stdin:
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        return read_stream(stream)
+
+    if args.input_fd is not None:
+        with os.fdopen(args.input_fd, "r", encoding="utf-8") as f:
+            return read_stream(f)
+
+    raise ValueError("one of --text, --text-file, --text-stdin, --input-fd is required")
+
+def open_output(args, default_stream):
+    """
+    출력 경로 선택: --output-file / --output-fd / (기본) stdout
+    """
+    if args.output_file:
+        return open(args.output_file, "w", encoding="utf-8")
+
+    if args.output_fd is not None:
+        return os.fdopen(args.output_fd, "w", encoding="utf-8")
+
+    if hasattr(default_stream, "reconfigure"):
+        default_stream.reconfigure(encoding="utf-8")
+    return default_stream
+
+def handle_request(request: dict):
+    """
+    단일 요청 처리 (serve / batch 모드 공용)
+    request: {"mode", "title", "text", "source", "target"}
+    - "targets": [...]가 있으면 다국어 동시 번역 → {target: text} 반환
+    - "job": 작업 ID가 있으면 문단 체크포인트에서 이어서 번역
+    - mode "finish": 작업 완료 → 해당 작업("job")의 체크포인트 / 고유명사 스냅샷 고정 삭제
+    """
+    mode = request.get("mode", "translate")
+    text = request.get("text", "")
+
+    if mode == "restructure":
+        return restructure_paragraphs_only(text, request.get("target", "en"))
+
+    if mode == "translate":
+        from translation_core.pipeline import translate_text, translate_text_multi
+
+        if not request.get("title"):
+            raise ValueError("title is required for translate mode")
+
+        if request.get("targets"):
+            return translate_text_multi(
+                title=request["title"],
+                text=text,
+                source_language=request.get("source", "ko"),
+                targets=request["targets"],
+            )
+
+        return translate_text(
+            title=request["title"],
+            text=text,
+            source_language=request.get("source", "ko"),
+            target_language=request.get("target", "en"),
+            job_id=request.get("job"),
+        )
+
+    if mode == "finish":
+        from translation_core import checkpoint, entity_snapshot
+
+        if not request.get("job"):
+            raise ValueError("job is required for finish mode")
+
+        checkpoint.clear(request["job"])
+        entity_snapshot.unpin(request["job"])
+        return ""
+
+    if mode == "ping":
+        return "pong"
+
+    raise ValueError(f"Unknown mode: {mode}")
+
+def serve(stdin, stdout):
+    """
+    상주 워커 모드 (JSON Lines 프로토콜)
+
+    - 요청 1줄 = JSON 1개: {"id", "mode", "title", "text", "source", "target"}
+    - 응답 1줄 = JSON 1개: {"id", "ok": true, "result"} / {"id", "ok": false, "error"}
+    - 시작 시 {"event": "ready"} 1줄 출력
+    - stdin EOF → 진행 중인 요청 완료 후 종료
+
+    프로세스가 살아있는 동안 OpenAI 클라이언트(HTTP 커넥션 풀)와
+    고유명사 데이터가 재사용됨.
+    """
+    write_lock = threading.Lock()
+
+    def write_frame(frame: dict):
+        line = json.dumps(frame, ensure_ascii=False)
+        with write_lock:
+            stdout.write(line + "\n")
+            stdout.flush()
+
+    def run(request_id, request: dict):
+        try:
+            result = handle_request(request)
+            write_frame({"id": request_id, "ok": True, "result": result})
+        except Exception as e:
+            print(f"[Python] Request {request_id} failed: {e}", file=sys.stderr)
+            write_frame({"id": request_id, "ok": False, "error": str(e)})
+
+    # 상주 프로세스는 파이프라인 모듈을 미리 로드해 첫 요청 지연을 없앰
+    import translation_core.pipeline  # noqa: F401
+
+    write_frame({"event": "ready"})
+
+    with ThreadPoolExecutor(max_workers=SERVE_MAX_WORKERS) as executor:
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                write_frame({"id": None, "ok": False, "error": f"Invalid JSON: {e}"})
+                continue
+            if not isinstance(request, dict):
+                write_frame({"id": None, "ok": False, "error": "Invalid request: expected a JSON object"})
+                continue
+
+            if request.get("mode") == "shutdown":
+                break
+
+            executor.submit(run, request.get("id"), request)
+
+def parse_manifest(raw: str) -> list:
+    """
+    batch 매니페스트 파싱
+    - JSON 배열 또는 NDJSON(1줄 = 항목 1개) 모두 허용
+    - 항목: {"job_id", "chunk_index", "title", "source", "target", "text"}
+    - job_id가 있으면 serve 모드와 같은 작업 키("job_id:chunk_index")로 체크포인트 / 고유명사 고정 사용
+    """
+    raw = raw.strip()
+    if not raw:
+        return []
+
+    if raw.startswith("["):
+        items = json.loads(raw)
+    else:
+        items = [json.loads(line) for line in raw.splitlines() if line.strip()]
+
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"Manifest item {i} is not an object")
+        if "text" not in item or "target" not in item:
+            raise ValueError(f"Manifest item {i} requires text and target")
+
+    return items
+
+def run_batch(items: list, out, max_workers: int = BATCH_MAX_WORKERS) -> int:
+    """
+    batch 모드: 한 프로세스 안에서 여러 청크 × 언어를 동시 처리
+    - 동시 처리 수는 max_workers로 제한
+    - 항목이 끝나는 순서대로 NDJSON 1줄씩 기록
+    - 반환값: 실패한 항목 수
+    """
+    failed = 0
+
+    def run(item: dict) -> dict:
+        frame = {
+            "job_id": item.get("job_id"),
+            "chunk_index": item.get("chunk_index"),
+            "target": item.get("target"),
+        }
+        request = item
+        if item.get("job_id") and not item.get("job"):
+            # Worker(index.ts)가 serve 요청에 붙이는 작업 키와 같은 형식
+            job = str(item["job_id"])
+            if item.get("chunk_index") is not None:
+                job = f"{job}:{item['chunk_index']}"
+            request = {**item, "job": job}
+        try:
+            result = handle_request(request)
+            frame.update(ok=True, result=result)
+        except Exception as e:
+            print(f"[Python] Batch item {frame['job_id']}#{frame['chunk_index']} failed: {e}", file=sys.stderr)
+            frame.update(ok=False, error=str(e))
+        return frame
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(run, item) for item in items]
+        for future in as_completed(futures):
+            frame = future.result()
+            if not frame["ok"]:
+                failed += 1
+            out.write(json.dumps(frame, ensure_ascii=False) + "\n")
+            out.flush()
+
+    return failed
+
+def stream_translation(title: str, text: str, source: str, target: str, out):
+    """
+    문단 단위 NDJSON 스트리밍 출력
+    - 모델 출력 도착 시: {"unit": [문단 인덱스...], "delta": 텍스트} (미리보기, 이어 붙여 표시)
+    - 미리보기 무효 (재시도): {"unit": [...], "reset": true}
+    - 문단 완료 시: {"index", "text", "stats"} (확정 결과)
+    - 마지막 줄: {"event": "done", "result": 구조 처리/문단 리듬 적용된 최종 텍스트}
+    """
+    from translation_core.pipeline import iter_translate_text, finalize_paragraphs
+
+    # 미리보기 콜백은 작업 스레드에서 호출됨
+    write_lock = threading.Lock()
+
+    def emit(frame: dict):
+        with write_lock:
+            out.write(json.dumps(frame, ensure_ascii=False) + "\n")
+            out.flush()
+
+    def on_delta(unit: list, delta):
+        if delta is None:
+            emit({"unit": unit, "reset": True})
+        else:
+            emit({"unit": unit, "delta": delta})
+
+    translated_paragraphs = []
+    for index, translated, stats in iter_translate_text(title, text, source, target, on_delta=on_delta):
+        translated_paragraphs.append(translated)
+        emit({"index": index, "text": translated, "stats": stats})
+
+    result = finalize_paragraphs(translated_paragraphs, target) if translated_paragraphs else ""
+    out.write(json.dumps({"event": "done", "result": result}, ensure_ascii=False) + "\n")
+    out.flush()
+
+def translate_incremental(args, text: str) -> str:
+    """
+    --alignment-in / --alignment-out 처리 (증분 재번역)
+    """
+    from translation_core.pipeline import translate_text_incremental
+
+    previous = None
+    if args.alignment_in and os.path.exists(args.alignment_in):
+        with open(args.alignment_in, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    result, alignment, stats = translate_text_incremental(
+        title=args.title,
+        text=text,
+        previous_alignment=previous,
+        source_language=args.source,
+        target_language=args.target,
+    )
+    print(f"[Python] Incremental translation: {stats}", file=sys.stderr)
+
+    if args.alignment_out:
+        with open(args.alignment_out, "w", encoding="utf-8") as f:
+            json.dump(alignment, f, ensure_ascii=False)
+
+    return result
+
 def main():
     parser = argparse.ArgumentParser(description='Translate text using translation_core')
-    parser.add_argument('--mode', default='translate', choices=['translate', 'restructure'], 
-                        help='Mode: translate (full pipeline) or restructure (paragraph editing only)')
+    parser.add_argument('--mode', default='translate', choices=['translate', 'restructure', 'serve', 'batch'], 
+                        help='Mode: translate (full pipeline), restructure (paragraph editing only), serve (long-lived JSON Lines worker) or batch (manifest → NDJSON)')
     parser.add_argument('--title', help='Novel title (required for translate mode)')
-    parser.add_argument('--text', required=True, help='Text to translate or restructure')
+
+    input_group = parser.add_mutually_exclusive_group()
+    input_group.add_argument('--text', help='Text to translate or restructure (batch mode: manifest JSON)')
+    input_group.add_argument('--text-file', help='Read text from a UTF-8 file instead of argv')
+    input_group.add_argument('--text-stdin', action='store_true', help='Read text from stdin (UTF-8)')
+    input_group.add_argument('--input-fd', type=int, help='Read text from an inherited file descriptor (UTF-8)')
+
+    output_group = parser.add_mutually_exclusive_group()
+    output_group.add_argument('--output-file', help='Write result to a UTF-8 file instead of stdout')
+    output_group.add_argument('--output-fd', type=int, help='Write result to an inherited file descriptor')
+
     parser.add_argument('--source', default='ko', help='Source language (default: ko)')
     parser.add_argument('--target', default='en', help='Target language (default: en)')
+    parser.add_argument('--targets', help='Comma-separated target languages; translates into all of them in one run and outputs a JSON object')
+    parser.add_argument('--stream', action='store_true',
+                        help='Translate mode: emit one NDJSON line per paragraph as it completes, then a final {"event": "done"} line')
+    parser.add_argument('--alignment-in',
+                        help='Translate mode: previous alignment sidecar (JSON); only changed paragraphs are re-translated')
+    parser.add_argument('--alignment-out',
+                        help='Translate mode: write the paragraph alignment sidecar (JSON) for the next incremental run')
+    parser.add_argument('--job-id',
+                        help='Translate mode: job ID for paragraph checkpoints; a retried job resumes where it stopped')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the translation stage cache (no lookups, no writes)')
+    parser.add_argument('--concurrency', type=int, default=BATCH_MAX_WORKERS,
+                        help=f'Max items in flight for batch mode (default: {BATCH_MAX_WORKERS})')
     
     args = parser.parse_args()
 
+    # 🔒 stdout은 결과/프로토콜 전용: 파이프라인 디버그 출력은 stderr로 보냄
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+
+    if args.no_cache:
+        from translation_core import translation_cache
+        translation_cache.set_enabled(False)
+
+    if args.mode == 'serve':
+        serve(sys.stdin, real_stdout)
+        sys.exit(0)
+
     try:
+        text = read_input(args)
+
+        if args.mode == 'batch':
+            # 매니페스트 항목별 결과를 NDJSON으로 스트리밍
+            items = parse_manifest(text)
+            out = open_output(args, real_stdout)
+            try:
+                failed = run_batch(items, out, args.concurrency)
+            finally:
+                if out is not real_stdout:
+                    out.close()
+            sys.exit(1 if failed else 0)
+
+        if args.mode == 'translate' and args.stream:
+            if not args.title:
+                print("Error: --title is required for translate mode", file=sys.stderr)
+                sys.exit(1)
+            out = open_output(args, real_stdout)
+            try:
+                stream_translation(args.title, text, args.source, args.target, out)
+            finally:
+                if out is not real_stdout:
+                    out.close()
+            sys.exit(0)
+
+        if args.mode == 'translate' and (args.alignment_in or args.alignment_out):
+            if not args.title:
+                print("Error: --title is required for translate mode", file=sys.stderr)
+                sys.exit(1)
+            result = translate_incremental(args, text)
+            out = open_output(args, real_stdout)
+            try:
+                write_stream(out, result)
+            finally:
+                if out is not real_stdout:
+                    out.close()
+            sys.exit(0)
+
         if args.mode == 'restructure':
             # 문단 편집만 수행
-            result = restructure_paragraphs_only(args.text, args.target)
+            result = restructure_paragraphs_only(text, args.target)
         else:
             # 전체 번역 파이프라인
             if not args.title:
                 print("Error: --title is required for translate mode", file=sys.stderr)
                 sys.exit(1)
             
-            result = translate_text(
-                title=args.title,
-                text=args.text,
-                source_language=args.source,
-                target_language=args.target
-            )
+            result = handle_request({
+                "mode": "translate",
+                "title": args.title,
+                "text": text,
+                "source": args.source,
+                "target": args.target,
+                "targets": [t.strip() for t in args.targets.split(",") if t.strip()] if args.targets else None,
+                "job": args.job_id,
+            })
+
+            # 다국어 결과는 {target: text} JSON으로 출력
+            if isinstance(result, dict):
+                result = json.dumps(result, ensure_ascii=False)
         
         # Output only the result (no extra logging)
-        print(result, end='')
+        out = open_output(args, real_stdout)
+        try:
+            write_stream(out, result)
+        finally:
+            if out is not real_stdout:
+                out.close()
         sys.exit(0)
         
     except Exception as e:
@@ -0,0 +1,122 @@
+# translation_core/checkpoint.py
+
+import os
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+
+# ===============================
+# 번역 작업 체크포인트 (문단 단위, SQLite WAL, 프로세스 간 공유)
+# ===============================
+# 작업(job) 도중 프로세스가 죽거나 타임아웃으로 재시도되어도
+# 이미 번역이 끝난 문단은 다시 요청하지 않도록 문단 완료 즉시 기록한다.
+# 키: (job_id, 문단 해시) - 문단 해시는 원문 문단 + 언어쌍 기준
+# 작업이 완료(DONE)되면 clear()로 삭제 → 같은 작업을 다시 번역하면 처음부터 (실패/중단된 시도만 이어서)
+CHECKPOINT_ENABLED = os.getenv("TRANSLATION_CHECKPOINTS", "true").lower() == "true"
+CHECKPOINT_PATH = os.getenv(
+    "TRANSLATION_CHECKPOINT_PATH",
+    os.path.join(tempfile.gettempdir(), "narra_translation_checkpoints.sqlite3"),
+)
+# 이보다 오래된 체크포인트는 정리 (재시도 가능 기간)
+CHECKPOINT_TTL_SECONDS = int(os.getenv("TRANSLATION_CHECKPOINT_TTL_HOURS", "48")) * 3600
+
+# 문단 형식/번역 경로가 바뀌면 올려서 기존 체크포인트 무효화
+CHECKPOINT_VERSION = 1
+
+# 쓰기 N회마다 한 번 만료 정리
+_PRUNE_EVERY = 500
+
+_local = threading.local()
+_lock = threading.Lock()
+_writes = 0
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(CHECKPOINT_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(CHECKPOINT_PATH, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS paragraphs (
+                job_id TEXT NOT NULL,
+                paragraph_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (job_id, paragraph_hash)
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_paragraphs_created ON paragraphs(created_at)")
+        _local.conn = conn
+    return conn
+
+
+def paragraph_hash(paragraph: str, source_language: str, target_language: str) -> str:
+    payload = f"{CHECKPOINT_VERSION}\0{source_language}\0{target_language}\0{paragraph}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load(job_id: str) -> dict:
+    """
+    job_id로 저장된 완료 문단 → {paragraph_hash: result}
+    """
+    if not CHECKPOINT_ENABLED or not job_id:
+        return {}
+    try:
+        rows = _connect().execute(
+            "SELECT paragraph_hash, result FROM paragraphs WHERE job_id = ? AND created_at >= ?",
+            (job_id, time.time() - CHECKPOINT_TTL_SECONDS),
+        ).fetchall()
+        return dict(rows)
+    except sqlite3.Error as e:
+        # 체크포인트 장애가 번역을 막으면 안 됨
+        print(f"[checkpoint] Read error: {e}")
+        return {}
+
+
+def save(job_id: str, paragraph_hash: str, result: str):
+    global _writes
+    if not CHECKPOINT_ENABLED or not job_id:
+        return
+    try:
+        _connect().execute(
+            "INSERT OR REPLACE INTO paragraphs (job_id, paragraph_hash, result, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, paragraph_hash, result, time.time()),
+        )
+        with _lock:
+            _writes += 1
+            should_prune = _writes % _PRUNE_EVERY == 0
+        if should_prune:
+            prune()
+    except sqlite3.Error as e:
+        print(f"[checkpoint] Write error: {e}")
+
+
+def clear(job_id: str):
+    """
+    완료된 작업의 체크포인트 삭제 (청크별 키 "job_id:청크 번호" 포함)
+    """
+    if not CHECKPOINT_ENABLED or not job_id:
+        return
+    try:
+        # ';'는 ':' 다음 문자 → "job_id:"로 시작하는 키 범위 (PK 색인 사용)
+        _connect().execute(
+            "DELETE FROM paragraphs WHERE job_id = ? OR (job_id >= ? AND job_id < ?)",
+            (job_id, f"{job_id}:", f"{job_id};"),
+        )
+    except sqlite3.Error as e:
+        print(f"[checkpoint] Write error: {e}")
+
+
+def prune(max_age: float = None):
+    """
+    만료된 체크포인트 삭제
+    """
+    max_age = CHECKPOINT_TTL_SECONDS if max_age is None else max_age
+    _connect().execute("DELETE FROM paragraphs WHERE created_at < ?", (time.time() - max_age,))
@@ -1,20 +1,21 @@
-def chunk_text(text: str, max_chars: int = 2000):
+from translation_core.token_budget import input_budget, pack_units
+
+
+def chunk_text(text: str, source_language: str = "ko", target_language: str = None, total_budget: int = None):
     """
     긴 텍스트를 줄 단위로 안전하게 분할한다.
     GPT 입력 길이 초과 방지용.
-    """
-    chunks = []
-    buf = ""
 
-    for line in text.splitlines(keepends=True):
-        if len(buf) + len(line) > max_chars:
-            if buf.strip():
-                chunks.append(buf)
-            buf = line
-        else:
-            buf += line
+    문자 수가 아니라 토큰 예산(입력 + 예상 출력) 기준으로 묶는다.
+    예산을 넘는 한 줄은 문장 단위로 다시 나눈다.
+    """
+    max_tokens = input_budget(source_language, target_language, total_budget)
+    lines = text.splitlines(keepends=True)
 
-    if buf.strip():
-        chunks.append(buf)
+    chunks = []
+    for group in pack_units(lines, max_tokens, split_oversized=True):
+        buf = "".join(group)
+        if buf.strip():
+            chunks.append(buf)
 
     return chunks
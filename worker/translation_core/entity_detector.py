@@ -2,6 +2,10 @@ import os
 import json
 import re
 from translation_core.openai_client import client
+from translation_core.chunker import chunk_text
+
+# 추출 요청 1회 입력 토큰 상한 (출력은 짧은 JSON 배열)
+ENTITY_CHUNK_TOKENS = 2400
 
 SYSTEM_PROMPT = """
 너는 웹소설 '한국어 원문'에서 고유명사 후보를 최대한 많이 추출하는 역할이다.
@@ -39,11 +43,8 @@ def extract_entities(text: str):
         text = text.strip()
 
         # 🔒 길면 나눠서 전부 시도 (누락 방지)
-        CHUNK_SIZE = 3000
-        chunks = [
-            text[i:i + CHUNK_SIZE]
-            for i in range(0, len(text), CHUNK_SIZE)
-        ]
+        # 토큰 예산 기준, 줄 경계에서 분할 (단어 중간 절단 방지)
+        chunks = chunk_text(text, source_language="ko", total_budget=ENTITY_CHUNK_TOKENS)
 
         for chunk in chunks:
             res = client.chat.completions.create(
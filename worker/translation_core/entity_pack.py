@@ -0,0 +1,154 @@
+# translation_core/entity_pack.py
+
+import os
+import mmap
+import struct
+import hashlib
+import tempfile
+from collections.abc import Mapping
+
+# ===============================
+# 고유명사 바이너리 스냅샷 (소설 × 대상 언어, mmap)
+# ===============================
+# load_entities() JSON을 매 프로세스마다 파싱/필터링하고 matcher trie를 다시 만드는 대신
+# 대상 언어별 {원문: 번역}과 matcher trie 정규식을 파일 1개로 저장해 두고 mmap으로 연다.
+# - 여는 비용은 헤더 읽기뿐 (고유명사 수와 무관), 조회는 정렬된 색인 이진 탐색
+# - 여러 worker 프로세스가 같은 파일을 열면 page cache 1벌을 공유
+# - 파일은 임시 파일 → os.replace로 교체 (이미 열린 mmap은 이전 내용 그대로 유효)
+PACK_ENABLED = os.getenv("ENTITY_PACKS", "true").lower() == "true"
+PACK_DIR = os.getenv(
+    "ENTITY_PACK_DIR",
+    os.path.join(tempfile.gettempdir(), "narra_entity_packs"),
+)
+
+# 파일 형식이 바뀌면 올림 (이전 형식 파일은 무시하고 다시 생성)
+PACK_FORMAT_VERSION = 1
+_MAGIC = b"NREP"
+
+# 헤더 (little-endian)
+#   magic, 형식 버전, 예약, 항목 수, 스냅샷 버전 해시(sha256 hex),
+#   색인 위치, 문자열 영역 위치/길이, 여러 글자 이름 trie 위치/길이, 1글자 이름 trie 위치/길이
+_HEADER = struct.Struct("<4sHHI64sQQQQQQQ")
+# 색인 항목 (원문 이름 UTF-8 바이트순 정렬): 이름 위치/길이, 번역 위치/길이 (문자열 영역 기준)
+_ENTRY = struct.Struct("<IIII")
+
+
+def _digest(version: str) -> bytes:
+    return hashlib.sha256(version.encode("utf-8")).hexdigest().encode("ascii")
+
+
+def pack_path(title: str, target_language: str) -> str:
+    name = hashlib.sha256(title.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(PACK_DIR, f"{name}.{target_language}.nrep")
+
+
+def build(path: str, version: str, entities: dict, matcher_tables: tuple):
+    """
+    {원문: 번역} + matcher trie 정규식 (multi, single) → 바이너리 스냅샷 파일
+    """
+    items = sorted(
+        ((name.encode("utf-8"), translation.encode("utf-8")) for name, translation in entities.items()),
+        key=lambda item: item[0],
+    )
+    strings = bytearray()
+    index = bytearray()
+    for name, translation in items:
+        index += _ENTRY.pack(len(strings), len(name), len(strings) + len(name), len(translation))
+        strings += name
+        strings += translation
+
+    multi, single = (table.encode("utf-8") for table in matcher_tables)
+    index_off = _HEADER.size
+    strings_off = index_off + len(index)
+    multi_off = strings_off + len(strings)
+    single_off = multi_off + len(multi)
+    header = _HEADER.pack(
+        _MAGIC, PACK_FORMAT_VERSION, 0, len(items), _digest(version),
+        index_off, strings_off, len(strings), multi_off, len(multi), single_off, len(single),
+    )
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(index)
+            f.write(strings)
+            f.write(multi)
+            f.write(single)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def open_pack(path: str, version: str):
+    """
+    스냅샷 버전이 같은 파일이면 PackedEntities, 없거나 형식/버전이 다르면 None
+    """
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # 파일 없음 / 빈 파일
+        return None
+
+    if len(mm) < _HEADER.size:
+        mm.close()
+        return None
+    header = _HEADER.unpack_from(mm, 0)
+    if header[0] != _MAGIC or header[1] != PACK_FORMAT_VERSION or header[4] != _digest(version):
+        mm.close()
+        return None
+    return PackedEntities(mm, header)
+
+
+class PackedEntities(Mapping):
+    """
+    mmap된 바이너리 스냅샷 위의 읽기 전용 {원문: 번역}
+    (파이프라인이 쓰는 get / keys / len / in 은 dict와 동일하게 동작)
+    """
+
+    def __init__(self, mm: mmap.mmap, header: tuple):
+        self._mm = mm
+        (_, _, _, self._count, _, self._index_off, self._strings_off, _,
+         self._multi_off, self._multi_len, self._single_off, self._single_len) = header
+
+    def _entry(self, i: int):
+        return _ENTRY.unpack_from(self._mm, self._index_off + i * _ENTRY.size)
+
+    def _bytes(self, offset: int, length: int) -> bytes:
+        start = self._strings_off + offset
+        return self._mm[start:start + length]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            name_off, name_len, _, _ = self._entry(i)
+            yield self._bytes(name_off, name_len).decode("utf-8")
+
+    def __getitem__(self, name: str) -> str:
+        key = name.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name_off, name_len, tr_off, tr_len = self._entry(mid)
+            probe = self._bytes(name_off, name_len)
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return self._bytes(tr_off, tr_len).decode("utf-8")
+        raise KeyError(name)
+
+    def matcher_tables(self) -> tuple:
+        """
+        저장된 matcher trie 정규식 (여러 글자 이름, 1글자 이름) - placeholder.get_matcher가 사용
+        """
+        multi = self._mm[self._multi_off:self._multi_off + self._multi_len].decode("utf-8")
+        single = self._mm[self._single_off:self._single_off + self._single_len].decode("utf-8")
+        return multi, single
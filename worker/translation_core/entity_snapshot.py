@@ -0,0 +1,215 @@
+# translation_core/entity_snapshot.py
+
+import os
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작 (프로세스 안 single-flight만)
+    fcntl = None
+
+# ===============================
+# 고유명사 스냅샷 디스크 캐시 (소설별, SQLite WAL, 프로세스 간 공유)
+# ===============================
+# Storage 응답 본문(JSON 원문)을 ETag와 함께 보관한다.
+# - ENTITY_SNAPSHOT_TTL 안이면 네트워크 없이 사용, 지나면 If-None-Match로 재검증
+# - Storage 장애 시 만료된 스냅샷이라도 마지막 것을 사용
+# - 작업(job)별로 처음 사용한 스냅샷 버전을 고정 → 청크마다 다시 받지 않음
+#   (고정은 ENTITY_SNAPSHOT_PIN_TTL 동안만 유효, 작업이 완료되면 unpin()으로 삭제)
+SNAPSHOT_ENABLED = os.getenv("ENTITY_SNAPSHOTS", "true").lower() == "true"
+SNAPSHOT_PATH = os.getenv(
+    "ENTITY_SNAPSHOT_PATH",
+    os.path.join(tempfile.gettempdir(), "narra_entity_snapshots.sqlite3"),
+)
+SNAPSHOT_TTL = float(os.getenv("ENTITY_SNAPSHOT_TTL", "300"))
+# 작업별 스냅샷 고정 유지 시간 (초, 기본 ENTITY_SNAPSHOT_TTL)
+# 지나면 고정을 무시하고 평소처럼 재검증 → 오래 걸리거나 재시도된 작업이 낡은 고유명사를 계속 쓰지 않음
+PIN_TTL_SECONDS = float(os.getenv("ENTITY_SNAPSHOT_PIN_TTL", str(SNAPSHOT_TTL)))
+
+# 쓰기 N회마다 한 번 만료된 고정 정리
+_PRUNE_EVERY = 200
+
+# 프로세스 간 소설별 잠금: 잠금 파일의 바이트 구간 (title 해시로 분산)
+_LOCK_SLOTS = 4096
+
+_local = threading.local()
+_lock = threading.Lock()
+_writes = 0
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(SNAPSHOT_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(SNAPSHOT_PATH, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                title TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                etag TEXT,
+                body TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_pins (
+                job_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                version TEXT NOT NULL,
+                pinned_at REAL NOT NULL,
+                PRIMARY KEY (job_id, title)
+            )
+            """
+        )
+        _local.conn = conn
+    return conn
+
+
+def body_version(etag: str, body: str) -> str:
+    """
+    스냅샷 버전: ETag가 있으면 ETag, 없으면 본문 해시
+    """
+    return etag or hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def read(title: str):
+    """
+    title의 마지막 스냅샷 → {"version", "etag", "body", "age"} (없거나 비활성이면 None)
+    """
+    if not SNAPSHOT_ENABLED:
+        return None
+    try:
+        row = _connect().execute(
+            "SELECT version, etag, body, fetched_at FROM snapshots WHERE title = ?",
+            (title,),
+        ).fetchone()
+    except sqlite3.Error as e:
+        # 스냅샷 장애가 번역을 막으면 안 됨 (Storage에서 직접 받음)
+        print(f"[entity_snapshot] Read error: {e}")
+        return None
+    if row is None:
+        return None
+    version, etag, body, fetched_at = row
+    return {"version": version, "etag": etag, "body": body, "age": time.time() - fetched_at}
+
+
+def write(title: str, etag: str, body: str) -> str:
+    """
+    새로 받은 본문 저장 → 버전
+    """
+    global _writes
+    version = body_version(etag, body)
+    if not SNAPSHOT_ENABLED:
+        return version
+    try:
+        _connect().execute(
+            "INSERT OR REPLACE INTO snapshots (title, version, etag, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (title, version, etag, body, time.time()),
+        )
+        with _lock:
+            _writes += 1
+            should_prune = _writes % _PRUNE_EVERY == 0
+        if should_prune:
+            prune()
+    except sqlite3.Error as e:
+        print(f"[entity_snapshot] Write error: {e}")
+    return version
+
+
+def touch(title: str):
+    """
+    304 Not Modified: 본문은 그대로, 받은 시각만 갱신
+    """
+    if not SNAPSHOT_ENABLED:
+        return
+    try:
+        _connect().execute("UPDATE snapshots SET fetched_at = ? WHERE title = ?", (time.time(), title))
+    except sqlite3.Error as e:
+        print(f"[entity_snapshot] Write error: {e}")
+
+
+def pinned_version(job_id: str, title: str):
+    """
+    작업이 고정한 스냅샷 버전 (없으면 None)
+    """
+    if not SNAPSHOT_ENABLED or not job_id:
+        return None
+    try:
+        row = _connect().execute(
+            "SELECT version FROM job_pins WHERE job_id = ? AND title = ? AND pinned_at >= ?",
+            (job_id, title, time.time() - PIN_TTL_SECONDS),
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"[entity_snapshot] Read error: {e}")
+        return None
+    return row[0] if row else None
+
+
+def pin(job_id: str, title: str, version: str):
+    if not SNAPSHOT_ENABLED or not job_id:
+        return
+    try:
+        _connect().execute(
+            "INSERT OR REPLACE INTO job_pins (job_id, title, version, pinned_at) VALUES (?, ?, ?, ?)",
+            (job_id, title, version, time.time()),
+        )
+    except sqlite3.Error as e:
+        print(f"[entity_snapshot] Write error: {e}")
+
+
+def unpin(job_id: str):
+    """
+    완료된 작업의 스냅샷 고정 삭제
+    """
+    if not SNAPSHOT_ENABLED or not job_id:
+        return
+    try:
+        _connect().execute("DELETE FROM job_pins WHERE job_id = ?", (job_id,))
+    except sqlite3.Error as e:
+        print(f"[entity_snapshot] Write error: {e}")
+
+
+def prune(max_age: float = None):
+    """
+    만료된 작업 고정 삭제 (스냅샷 본문은 소설당 1개라 유지)
+    """
+    max_age = PIN_TTL_SECONDS if max_age is None else max_age
+    _connect().execute("DELETE FROM job_pins WHERE pinned_at < ?", (time.time() - max_age,))
+
+
+@contextmanager
+def fetch_lock(title: str):
+    """
+    같은 소설을 여러 프로세스가 동시에 받지 않도록 잠금 (single-flight)
+    먼저 잡은 프로세스가 받아 저장하면, 기다린 쪽은 read()로 그 결과를 사용
+    """
+    if not SNAPSHOT_ENABLED or fcntl is None:
+        yield
+        return
+
+    slot = int(hashlib.sha256(title.encode("utf-8")).hexdigest(), 16) % _LOCK_SLOTS
+    try:
+        fd = os.open(f"{SNAPSHOT_PATH}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError as e:
+        print(f"[entity_snapshot] Lock error: {e}")
+        yield
+        return
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX, 1, slot)
+        try:
+            yield
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN, 1, slot)
+    finally:
+        os.close(fd)
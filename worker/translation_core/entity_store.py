@@ -1,18 +1,48 @@
 import os
+import json
+import time
+import threading
 import requests
 
+from translation_core import entity_pack, entity_snapshot
+from translation_core.placeholder import matcher_tables
+
 # ===============================
 # Storage API 설정
 # ===============================
 STORAGE_BASE_URL = os.getenv("STORAGE_BASE_URL")
 STORAGE_API_KEY = os.getenv("STORAGE_API_KEY")  # 있으면 사용
 
-if not STORAGE_BASE_URL:
-    raise RuntimeError("STORAGE_BASE_URL is not set")
+# 상주 프로세스(serve 모드)에서 고유명사 재사용 시간 (초, 0이면 비활성)
+ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", "60"))
+
+# 스냅샷도 없이 Storage 호출이 실패하면 이 시간 동안 재호출하지 않음 (초)
+# → 장애 중 청크마다 타임아웃을 기다리지 않도록
+ENTITY_RETRY_AFTER = float(os.getenv("ENTITY_RETRY_AFTER", "10"))
+
+# 🔗 keep-alive 커넥션 재사용
+_session = requests.Session()
+
+_entity_cache = {}  # title -> (loaded_at, version, entities 또는 None - 버전만 확인)
+_target_cache = {}  # (title, target_language) -> (version, PackedEntities 또는 dict)
+_entity_cache_lock = threading.Lock()
+
+# 소설별 single-flight: 같은 소설을 동시에 여러 스레드가 받지 않음
+_flights = {}  # title -> Lock
+_flights_lock = threading.Lock()
+_failed_at = {}  # title -> 마지막 실패 시각 (스냅샷 없을 때만)
 
 # ===============================
 # 내부 유틸
 # ===============================
+def _storage_base_url() -> str:
+    # import 시점이 아니라 실제 Storage 호출 시점에 검사
+    # (restructure 전용 모드는 Storage를 쓰지 않음)
+    if not STORAGE_BASE_URL:
+        raise RuntimeError("STORAGE_BASE_URL is not set")
+    return STORAGE_BASE_URL
+
+
 def _headers():
     headers = {
         "Content-Type": "application/json",
@@ -22,31 +52,20 @@ def _headers():
     return headers
 
 
-# ===============================
-# 기존 인터페이스 유지
-# ===============================
-def load_entities(title: str) -> dict:
+def _flight(title: str) -> threading.Lock:
+    with _flights_lock:
+        return _flights.setdefault(title, threading.Lock())
+
+
+def _parse_entities(body: str) -> dict:
     """
-    기존: 로컬 JSON 로드
-    변경: Storage API에서 고유명사 로드
-    반환 포맷은 기존 파이프라인과 동일
+    Storage 응답 본문 → 파이프라인 고유명사 포맷
     """
-    try:
-        res = requests.get(
-            f"{STORAGE_BASE_URL}/api/novels/{title}/entities",
-            headers=_headers(),
-            timeout=10,
-        )
-        res.raise_for_status()
-        data = res.json()
-    except Exception:
-        # API 장애 시 기존 동작과 동일하게 빈 dict 반환
-        return {}
-
+    data = json.loads(body)
     entities = {}
 
     # ✅ Storage API 응답 형식: { entities: [...] }
-    entity_list = data.get("entities", data if isinstance(data, list) else [])
+    entity_list = data.get("entities", []) if isinstance(data, dict) else data
 
     for e in entity_list:
         translations = {}
@@ -67,6 +86,203 @@ def load_entities(title: str) -> dict:
     return entities
 
 
+def _cached(title: str, pinned: str = None, parse: bool = True):
+    """
+    프로세스 안 캐시 → (version, entities) 또는 None
+    작업이 고정한 버전이면 캐시 나이와 무관하게 (고정 자체는 ENTITY_SNAPSHOT_PIN_TTL까지만 유효),
+    아니면 ENTITY_CACHE_TTL 안에서만 사용
+    parse=False면 버전만 알고 아직 파싱하지 않은 항목(entities=None)도 적중
+    """
+    with _entity_cache_lock:
+        cached = _entity_cache.get(title)
+    if cached is None:
+        return None
+    loaded_at, version, entities = cached
+    if entities is None and parse:
+        return None
+    if pinned is not None:
+        return (version, entities) if version == pinned else None
+    if ENTITY_CACHE_TTL > 0 and time.monotonic() - loaded_at < ENTITY_CACHE_TTL:
+        return version, entities
+    return None
+
+
+def _remember(title: str, snapshot: dict, entities: dict = None, parse: bool = True):
+    """
+    스냅샷 → 프로세스 안 캐시에 기록 → (version, entities)
+    같은 버전이면 이미 만든 dict를 그대로 돌려줌 (matcher 캐시가 dict id 기준)
+    parse=False면 본문을 파싱하지 않고 버전만 기록 (entity_pack 경로)
+    """
+    version = snapshot["version"]
+    if entities is None:
+        with _entity_cache_lock:
+            cached = _entity_cache.get(title)
+        if cached and cached[1] == version:
+            entities = cached[2]
+        if entities is None and parse:
+            entities = _parse_entities(snapshot["body"])
+
+    with _entity_cache_lock:
+        _entity_cache[title] = (time.monotonic(), version, entities)
+    return version, entities
+
+
+def _fetch(title: str, snapshot: dict = None):
+    """
+    Storage에서 받기 (마지막 스냅샷이 있으면 If-None-Match로 재검증)
+    반환: (스냅샷, 파싱된 고유명사 또는 None)
+    실패 시 마지막 스냅샷 (만료됐어도), 그것도 없으면 (None, None)
+    """
+    base_url = _storage_base_url()
+    headers = _headers()
+    if snapshot and snapshot["etag"]:
+        headers["If-None-Match"] = snapshot["etag"]
+
+    try:
+        res = _session.get(
+            f"{base_url}/api/novels/{title}/entities",
+            headers=headers,
+            timeout=10,
+        )
+        if res.status_code == 304 and snapshot:
+            entity_snapshot.touch(title)
+            return snapshot, None
+        res.raise_for_status()
+        body = res.text
+        entities = _parse_entities(body)
+    except Exception as e:
+        if snapshot:
+            print(f"[entity_store] ⚠️ Storage error ({e}), using last snapshot ({snapshot['age']:.0f}s old)")
+            return snapshot, None
+        print(f"[entity_store] ⚠️ Storage error ({e}), no snapshot available - continuing without entities")
+        return None, None
+
+    etag = res.headers.get("ETag")
+    version = entity_snapshot.write(title, etag, body)
+    return {"version": version, "etag": etag, "body": body, "age": 0.0}, entities
+
+
+# ===============================
+# 스냅샷 선택 (캐시 → 디스크 → Storage)
+# ===============================
+def _resolve(title: str, job_id: str = None, parse: bool = True):
+    """
+    지금 사용할 고유명사 스냅샷 → (version, entities)
+    - 디스크 스냅샷 (entity_snapshot): ENTITY_SNAPSHOT_TTL 안이면 Storage 호출 없음,
+      지나면 ETag 재검증, Storage 장애 시 마지막 스냅샷 사용
+    - 같은 소설을 동시에 부르면 1회만 받음 (스레드/프로세스 간 single-flight)
+    - job_id: 작업이 처음 사용한 스냅샷 버전을 고정 → 같은 작업의 나머지 청크는 재검증 없이 사용
+      (고정한 버전이 디스크에서 교체됐으면 새로 받은 버전으로 다시 고정,
+       고정은 ENTITY_SNAPSHOT_PIN_TTL이 지나거나 작업이 완료되면 사라짐)
+    - parse=False: 이미 파싱된 것이 없으면 entities=None (버전만 필요할 때)
+    - 스냅샷도 없고 Storage도 실패: (None, {})
+    """
+    pinned = entity_snapshot.pinned_version(job_id, title)
+    hit = _cached(title, pinned, parse)
+    if hit is not None:
+        return hit
+
+    with _flight(title):
+        # 기다리는 동안 다른 스레드가 받았을 수 있음
+        hit = _cached(title, pinned, parse)
+        if hit is not None:
+            return hit
+
+        snapshot = entity_snapshot.read(title)
+        if snapshot is None and time.monotonic() - _failed_at.get(title, float("-inf")) < ENTITY_RETRY_AFTER:
+            return None, {}
+
+        entities = None
+        if not (snapshot and (snapshot["version"] == pinned or snapshot["age"] < entity_snapshot.SNAPSHOT_TTL)):
+            with entity_snapshot.fetch_lock(title):
+                # 기다리는 동안 다른 프로세스가 받았을 수 있음
+                snapshot = entity_snapshot.read(title) or snapshot
+                if not (snapshot and snapshot["age"] < entity_snapshot.SNAPSHOT_TTL):
+                    snapshot, entities = _fetch(title, snapshot)
+
+        if snapshot is None:
+            # 받은 적도 없고 Storage도 실패: 기존 동작과 동일하게 빈 dict
+            _failed_at[title] = time.monotonic()
+            return None, {}
+        _failed_at.pop(title, None)
+        entity_snapshot.pin(job_id, title, snapshot["version"])
+        return _remember(title, snapshot, entities, parse)
+
+
+def filter_entities(raw_entities: dict, target_language: str) -> dict:
+    """
+    load_entities() 결과 → {source_name: 대상 언어 번역} (locked 항목만)
+    """
+    return {
+        k: v["translations"][target_language]
+        for k, v in raw_entities.items()
+        if (
+            isinstance(v, dict)
+            and v.get("locked") is True
+            and isinstance(v.get("translations"), dict)
+            and target_language in v["translations"]
+        )
+    }
+
+
+# ===============================
+# 기존 인터페이스 유지
+# ===============================
+def load_entities(title: str, job_id: str = None) -> dict:
+    """
+    기존: 로컬 JSON 로드
+    변경: Storage API에서 고유명사 로드 (디스크 스냅샷 캐시 경유, _resolve 참고)
+    반환 포맷은 기존 파이프라인과 동일
+
+    같은 프로세스 안에서는 ENTITY_CACHE_TTL 동안 결과를 재사용
+    """
+    return _resolve(title, job_id)[1]
+
+
+def load_target_entities(title: str, target_language: str, job_id: str = None):
+    """
+    대상 언어별 {source_name: 번역} (locked 항목만) - 파이프라인 placeholder 치환/복원용
+
+    스냅샷 버전별로 entity_pack 바이너리 파일을 1회 만들어 두고 mmap으로 연다.
+    - 같은 버전 파일이 있으면 JSON 파싱/필터링/matcher trie 생성 없이 사용 (여는 비용은 고유명사 수와 무관)
+    - 같은 (소설, 대상 언어, 버전)이면 프로세스 안에서 같은 객체를 돌려줌 (matcher 캐시 재사용)
+    - 파일을 만들 수 없으면 필터링한 dict를 그대로 사용
+    """
+    version, entities = _resolve(title, job_id, parse=False)
+    if version is None:
+        return {}
+
+    key = (title, target_language)
+    with _entity_cache_lock:
+        cached = _target_cache.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    with _flight(key):
+        with _entity_cache_lock:
+            cached = _target_cache.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        path = entity_pack.pack_path(title, target_language)
+        packed = entity_pack.open_pack(path, version) if entity_pack.PACK_ENABLED else None
+        if packed is None:
+            if entities is None:
+                # 이 버전의 바이너리가 아직 없음: 1회 파싱 (버전도 같은 호출 결과로 맞춤)
+                version, entities = _resolve(title, job_id)
+            packed = filter_entities(entities, target_language)
+            if entity_pack.PACK_ENABLED and version is not None:
+                try:
+                    entity_pack.build(path, version, packed, matcher_tables(packed))
+                    packed = entity_pack.open_pack(path, version) or packed
+                except OSError as e:
+                    print(f"[entity_store] Entity pack write error: {e}")
+
+        with _entity_cache_lock:
+            _target_cache[key] = (version, packed)
+        return packed
+
+
 def save_entities(title: str, entities: dict):
     """
     ⚠️ DEPRECATED
@@ -81,10 +297,12 @@ def add_entities(title: str, new_entities: list[str]):
     체크된 고유명사만 Storage API에 추가
     기존 시그니처 유지
     """
+    base_url = _storage_base_url()
+
     for source_text in new_entities:
         try:
-            requests.post(
-                f"{STORAGE_BASE_URL}/api/novels/{title}/entities",
+            _session.post(
+                f"{base_url}/api/novels/{title}/entities",
                 headers=_headers(),
                 json={
                     "source_text": source_text,
@@ -0,0 +1,102 @@
+# translation_core/hedging.py
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ===============================
+# 헤지 요청 (tail latency 완화)
+# ===============================
+# 단계별 최근 지연시간 p95를 넘기도록 응답이 없으면 같은 요청을 한 번 더 보내고
+# 먼저 끝난 쪽 결과를 사용한다. 진 쪽 요청은 결과를 버린다
+# (동기 HTTP 호출은 중간 취소가 불가하므로 완료 후 폐기).
+#
+# HEDGE_STAGES: 헤지를 켤 단계 (예: "translate,edit", 기본 비활성)
+HEDGE_STAGES = {
+    stage.strip()
+    for stage in os.getenv("HEDGE_STAGES", "").split(",")
+    if stage.strip()
+}
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))  # p95 계산 최소 표본 수
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "2.0"))  # 초
+HEDGE_PERCENTILE = 0.95
+
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv("HEDGE_MAX_WORKERS", "32")), thread_name_prefix="hedge")
+_lock = threading.Lock()
+_latencies = {}  # stage -> deque[seconds]
+_stats = {}  # stage -> {"calls", "fired", "won"}
+
+
+def _count(stage: str, field: str):
+    with _lock:
+        _stats.setdefault(stage, {"calls": 0, "fired": 0, "won": 0})[field] += 1
+
+
+def record_latency(stage: str, seconds: float):
+    with _lock:
+        _latencies.setdefault(stage, deque(maxlen=200)).append(seconds)
+
+
+def hedge_delay(stage: str):
+    """
+    헤지 발사 시점 (초) = max(HEDGE_MIN_DELAY, 최근 p95)
+    헤지 비활성 단계이거나 표본이 부족하면 None
+    """
+    if stage not in HEDGE_STAGES:
+        return None
+    with _lock:
+        samples = sorted(_latencies.get(stage, ()))
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    p95 = samples[min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE))]
+    return max(HEDGE_MIN_DELAY, p95)
+
+
+def _timed(stage: str, fn):
+    started = time.perf_counter()
+    result = fn()
+    record_latency(stage, time.perf_counter() - started)
+    return result
+
+
+def hedged_call(stage: str, fn):
+    """
+    fn()을 실행하되, 헤지 대상 단계면 p95 지연 후 중복 요청을 보내 먼저 끝난 결과 반환
+    """
+    _count(stage, "calls")
+    delay = hedge_delay(stage)
+    if delay is None:
+        return _timed(stage, fn)
+
+    primary = _executor.submit(_timed, stage, fn)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    _count(stage, "fired")
+    backup = _executor.submit(_timed, stage, fn)
+    pending = {primary, backup}
+    first_error = None
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is backup:
+                    _count(stage, "won")
+                for other in pending:
+                    other.cancel()  # 실행 중이면 완료 후 결과만 버림
+                return future.result()
+            first_error = first_error or future.exception()
+
+    raise first_error
+
+
+def hedge_stats() -> dict:
+    """
+    단계별 {"calls", "fired", "won"} (fired = 헤지 발사, won = 헤지가 먼저 끝남)
+    """
+    with _lock:
+        return {stage: dict(counts) for stage, counts in _stats.items()}
@@ -1,26 +1,231 @@
 import os
-from openai import OpenAI, AzureOpenAI
+import time
+import threading
+from types import SimpleNamespace
+
+from translation_core import rate_limiter
+from translation_core.token_budget import estimate_tokens
+from translation_core.stream_guard import StreamGuard, RunawayOutputError
 
 # Railway 환경변수로 Azure/OpenAI 선택
 USE_AZURE = os.getenv("USE_AZURE_OPENAI", "false").lower() == "true"
 
-if USE_AZURE:
-    # Azure OpenAI 설정 (정식 SDK 방식)
-    # print("=" * 50)
-    # print("[OpenAI Client] 🔵 Using Azure OpenAI")
-    # print(f"[OpenAI Client] Endpoint: {os.getenv('AZURE_OPENAI_ENDPOINT')}")
-    # print(f"[OpenAI Client] API Version: {os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-15-preview')}")
-    # print("=" * 50)
-    client = AzureOpenAI(
-        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-01-preview")
-    )
-else:
+# 429 / 5xx / 타임아웃 재시도 횟수 (SDK 내부 재시도 대신 여기서 처리)
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# 호출별 데드라인: 기본 시간 + 예상 출력 토큰 / 생성 속도
+# (SDK 기본 600초 대신, 느린 응답 1건이 청크 전체를 붙잡지 않도록)
+DEADLINE_BASE_SECONDS = float(os.getenv("LLM_DEADLINE_BASE_SECONDS", "15"))
+DEADLINE_TOKENS_PER_SECOND = float(os.getenv("LLM_DEADLINE_TOKENS_PER_SECOND", "25"))
+
+# 스트리밍 수신 + 폭주 감지 (중단 시 같은 요청 재시도 횟수)
+STREAM_COMPLETIONS = os.getenv("LLM_STREAM", "true").lower() == "true"
+STREAM_GUARD_RETRIES = int(os.getenv("STREAM_GUARD_RETRIES", "2"))
+
+# stream_options(include_usage) 지원 여부: 구버전 Azure api-version은 400으로 거부
+# → 한 번 거부되면 이 프로세스에서는 보내지 않음 (usage 없이 스트리밍)
+_stream_usage = True
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _create_client():
+    # openai SDK import 자체가 무거우므로 첫 호출 시점까지 지연
+    from openai import OpenAI, AzureOpenAI
+
+    if USE_AZURE:
+        # Azure OpenAI 설정 (정식 SDK 방식)
+        # print("=" * 50)
+        # print("[OpenAI Client] 🔵 Using Azure OpenAI")
+        # print(f"[OpenAI Client] Endpoint: {os.getenv('AZURE_OPENAI_ENDPOINT')}")
+        # print(f"[OpenAI Client] API Version: {os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-15-preview')}")
+        # print("=" * 50)
+        return AzureOpenAI(
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-01-preview"),
+            max_retries=0,
+        )
+
     # 기존 OpenAI 설정
     # print("=" * 50)
     # print("[OpenAI Client] 🟢 Using OpenAI")
     # print("=" * 50)
-    client = OpenAI(
-        api_key=os.getenv("OPENAI_API_KEY")
+    return OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        max_retries=0,
     )
+
+
+def get_client():
+    """
+    프로세스 공용 OpenAI/Azure 클라이언트 (최초 호출 시 생성)
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_client()
+    return _client
+
+
+def _estimate_request_tokens(kwargs: dict):
+    """
+    요청 토큰 추정 → (입력 전체, 예상 출력)
+    출력은 max_tokens가 없으면 마지막 메시지(본문)와 같은 양으로 가정
+    """
+    messages = kwargs.get("messages") or []
+    contents = [m.get("content") or "" for m in messages if isinstance(m.get("content"), str)]
+    input_tokens = sum(estimate_tokens(c) for c in contents)
+    output_tokens = kwargs.get("max_tokens") or (estimate_tokens(contents[-1]) if contents else 0)
+    return input_tokens, output_tokens
+
+
+def deadline_for(output_tokens: int) -> float:
+    return DEADLINE_BASE_SECONDS + output_tokens / DEADLINE_TOKENS_PER_SECOND
+
+
+def _stream(kwargs: dict, deadline: float, on_delta=None):
+    """
+    stream=True로 요청하고 조각마다 StreamGuard 검사
+    완료되면 비스트리밍 응답과 같은 모양(choices[0].message.content, usage)으로 반환
+    """
+    messages = kwargs.get("messages") or []
+    guard = StreamGuard((messages[-1].get("content") or "") if messages else "")
+    started = time.monotonic()
+    finish_reason = None
+    usage = None
+
+    global _stream_usage
+    from openai import BadRequestError
+
+    options = {"stream_options": {"include_usage": True}} if _stream_usage else {}
+    try:
+        stream = get_client().chat.completions.create(stream=True, **options, **kwargs)
+    except BadRequestError as e:
+        if not options or "stream_options" not in str(e):
+            raise
+        print("[OpenAI Client] stream_options not supported by this API version, streaming without usage")
+        _stream_usage = False
+        stream = get_client().chat.completions.create(stream=True, **kwargs)
+    try:
+        for chunk in stream:
+            usage = getattr(chunk, "usage", None) or usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            finish_reason = getattr(choice, "finish_reason", None) or finish_reason
+            delta = getattr(choice.delta, "content", None)
+            if not delta:
+                continue
+            guard.feed(delta)
+            if on_delta is not None:
+                on_delta(delta)
+            # SDK timeout은 조각 사이 간격에만 적용되므로 전체 데드라인은 여기서 확인
+            if time.monotonic() - started > deadline:
+                raise RunawayOutputError(f"deadline {deadline:.0f}s exceeded")
+        guard.finish()
+    except RunawayOutputError as e:
+        e.partial = guard.text
+        raise
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()  # 중단 시 연결을 끊어 남은 출력 토큰 생성을 멈춤
+
+    message = SimpleNamespace(role="assistant", content=guard.text)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(index=0, message=message, finish_reason=finish_reason)],
+        usage=usage,
+    )
+
+
+def create_completion(on_delta=None, guard_retries: int = None, retry_timeouts: bool = True, **kwargs):
+    """
+    모든 LLM 호출 공용 경로
+    - 공유 RPM/TPM 버킷에서 허용될 때까지 대기
+    - 429는 Retry-After를 다른 프로세스와 공유하고 그만큼 대기
+    - 429 / 5xx / 타임아웃 / 연결 오류는 지터 포함 백오프로 재시도
+    - timeout 미지정 시 예상 출력 크기 기반 데드라인 적용
+    - LLM_STREAM=true(기본)면 스트리밍으로 받으며 폭주(길이/반복/placeholder) 감지 시
+      즉시 중단하고 같은 요청을 STREAM_GUARD_RETRIES회까지 재시도
+    - on_delta(text): 스트리밍 조각 콜백, 재시도로 앞서 받은 조각이 무효가 되면 on_delta(None)
+    - guard_retries / retry_timeouts: 호출부가 자체 재요청 횟수를 가질 때 (파이프라인 단계)
+      폭주 중단 재시도 횟수를 줄이고 타임아웃은 재시도 없이 raise → 재시도 횟수가 곱해지지 않음
+    """
+    from openai import APIConnectionError, APIStatusError, APITimeoutError
+
+    if guard_retries is None:
+        guard_retries = STREAM_GUARD_RETRIES
+
+    input_tokens, output_tokens = _estimate_request_tokens(kwargs)
+    tokens = input_tokens + output_tokens
+    deadline = kwargs.pop("timeout", None) or deadline_for(output_tokens)
+    kwargs["timeout"] = deadline
+    streaming = STREAM_COMPLETIONS and not kwargs.get("stream")
+    guard_attempts = 0
+
+    attempt = 0
+    while True:
+        rate_limiter.acquire(tokens)
+        retry_after = 0.0
+        try:
+            if streaming:
+                return _stream(kwargs, deadline, on_delta)
+            return get_client().chat.completions.create(**kwargs)
+        except RunawayOutputError as e:
+            if guard_attempts >= guard_retries:
+                raise
+            guard_attempts += 1
+            print(f"[OpenAI Client] {e}, retry {guard_attempts}/{guard_retries}")
+            if on_delta is not None:
+                on_delta(None)
+            continue
+        except APIConnectionError as e:
+            if isinstance(e, APITimeoutError) and not retry_timeouts:
+                raise
+            error = e
+        except APIStatusError as e:
+            if e.status_code not in RETRYABLE_STATUS:
+                raise
+            error = e
+            retry_after = rate_limiter.parse_retry_after(getattr(e.response, "headers", None))
+            if e.status_code == 429:
+                rate_limiter.set_cooldown(retry_after or rate_limiter.backoff_delay(attempt))
+
+        if attempt == MAX_RETRIES:
+            raise error
+
+        delay = rate_limiter.backoff_delay(attempt, retry_after)
+        print(f"[OpenAI Client] {type(error).__name__}, retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s")
+        if on_delta is not None:
+            on_delta(None)
+        time.sleep(delay)
+        attempt += 1
+
+
+class _Completions:
+    def create(self, on_delta=None, guard_retries: int = None, retry_timeouts: bool = True, **kwargs):
+        return create_completion(on_delta=on_delta, guard_retries=guard_retries, retry_timeouts=retry_timeouts, **kwargs)
+
+
+class _Chat:
+    completions = _Completions()
+
+
+class _LimitedClient:
+    """
+    기존 `from translation_core.openai_client import client` 사용처 호환용
+    - client.chat.completions.create → create_completion (속도 제한 + 재시도)
+    - 그 외 속성은 실제 클라이언트로 전달 (최초 접근 시 생성)
+    """
+
+    chat = _Chat()
+
+    def __getattr__(self, name):
+        return getattr(get_client(), name)
+
+
+client = _LimitedClient()
@@ -0,0 +1,58 @@
+# translation_core/paragraph_editors.py
+
+import importlib
+import threading
+
+# ===============================
+# 언어 코드 → 문단 리듬 에디터 (지연 import)
+# ===============================
+# 대상 언어의 에디터 모듈만 필요할 때 import 하여 cold start를 줄인다.
+PARAGRAPH_EDITORS = {
+    "ko": ("translation_core.paragraph_editor_ko", "restructure_paragraphs_ko"),  # Naver Series, Kakao Page
+    "en": ("translation_core.paragraph_editor_en", "restructure_paragraphs_en"),  # Wattpad, WebNovel
+    "ja": ("translation_core.paragraph_editor_ja", "restructure_paragraphs_ja"),  # Narou, Kakuyomu
+    "zh": ("translation_core.paragraph_editor_zh", "restructure_paragraphs_zh"),  # Qidian, Zongheng (매우 짧은 문단)
+    "es": ("translation_core.paragraph_editor_es", "restructure_paragraphs_es"),  # Wattpad Spanish
+    "fr": ("translation_core.paragraph_editor_fr", "restructure_paragraphs_fr"),  # Wattpad French
+    "de": ("translation_core.paragraph_editor_de", "restructure_paragraphs_de"),  # Wattpad German (긴 문장 보상)
+    "pt": ("translation_core.paragraph_editor_pt", "restructure_paragraphs_pt"),  # Wattpad Portuguese, Spirit Fanfics
+    "id": ("translation_core.paragraph_editor_id", "restructure_paragraphs_id"),  # Wattpad Indonesia, Cabaca
+}
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def get_paragraph_editor(language: str):
+    """
+    대상 언어의 restructure 함수 반환 (없으면 None)
+    """
+    entry = PARAGRAPH_EDITORS.get(language)
+    if entry is None:
+        return None
+
+    editor = _loaded.get(language)
+    if editor is None:
+        with _lock:
+            editor = _loaded.get(language)
+            if editor is None:
+                module_name, func_name = entry
+                editor = getattr(importlib.import_module(module_name), func_name)
+                _loaded[language] = editor
+    return editor
+
+
+def restructure_paragraphs(text: str, language: str) -> str:
+    """
+    언어별 문단 리듬 재구성
+    에디터가 없는 언어는 원문 그대로 반환
+    """
+    editor = get_paragraph_editor(language)
+    if editor is None:
+        print(f"[DEBUG] No paragraph editor for language: {language}")
+        return text
+
+    print(f"[DEBUG] Calling {editor.__name__}...")
+    result = editor(text)
+    print(f"[DEBUG] {editor.__name__} completed")
+    return result
@@ -1,20 +1,30 @@
 import os
+import re
+import time
+import asyncio
+import difflib
+import threading
+import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from translation_core.openai_client import client
+from translation_core import translation_cache, checkpoint
+from translation_core.hedging import HEDGE_STAGES, hedged_call, hedge_stats
+from translation_core.stream_guard import RunawayOutputError
+from translation_core.token_budget import estimate_tokens, input_budget, pack_units, plan_chunks, record_usage
+from translation_core.validation import VALIDATION_RETRIES, OutputValidationError, check_output
 
 # 🔗 고유명사 파이프라인 연결
-from translation_core.entity_store import load_entities
-from translation_core.placeholder import apply_placeholders, restore_placeholders
-
-# 🔗 언어별 문단 리듬 에디터 (LLM 기반)
-from translation_core.paragraph_editor_ko import restructure_paragraphs_ko
-from translation_core.paragraph_editor_en import restructure_paragraphs_en
-from translation_core.paragraph_editor_ja import restructure_paragraphs_ja
-from translation_core.paragraph_editor_zh import restructure_paragraphs_zh
-from translation_core.paragraph_editor_es import restructure_paragraphs_es
-from translation_core.paragraph_editor_fr import restructure_paragraphs_fr
-from translation_core.paragraph_editor_de import restructure_paragraphs_de
-from translation_core.paragraph_editor_pt import restructure_paragraphs_pt
-from translation_core.paragraph_editor_id import restructure_paragraphs_id
+from translation_core.entity_store import load_target_entities
+from translation_core.placeholder import (
+    PLACEHOLDER_RE,
+    apply_placeholders,
+    restore_placeholders,
+    restore_placeholders_checked,
+)
+
+# 🔗 언어별 문단 리듬 에디터 (LLM 기반, 대상 언어만 지연 import)
+from translation_core.paragraph_editors import restructure_paragraphs
 
 # 🔗 일본어 문단 안전 분할 (일본어 전용 - 규칙 기반, 레거시)
 from translation_core.paragraph_splitter_ja import split_long_paragraphs_ja
@@ -23,6 +33,53 @@ from translation_core.paragraph_splitter_ja import split_long_paragraphs_ja
 
 MODEL = "gpt-4omini"  # Azure deployment name
 
+# 문단 단위 동시 번역 수 (1이면 순차 처리)
+PARAGRAPH_CONCURRENCY = int(os.getenv("PARAGRAPH_CONCURRENCY", "4"))
+
+# 번역+편집 통합 1회 호출을 사용할 언어 ("all" 또는 "es,fr,de", 기본 3단계)
+FUSED_STAGE_LANGUAGES = {
+    lang.strip()
+    for lang in os.getenv("FUSED_STAGE_LANGUAGES", "").split(",")
+    if lang.strip()
+}
+
+# 짧은 문단 묶음 번역 (1회 요청에 여러 문단)
+PARAGRAPH_PACKING = os.getenv("PARAGRAPH_PACKING", "true").lower() == "true"
+PACK_TOKEN_BUDGET = int(os.getenv("PACK_TOKEN_BUDGET", "1200"))  # 묶음 1개 입력 토큰 상한 (추정치)
+PACK_MAX_PARAGRAPHS = int(os.getenv("PACK_MAX_PARAGRAPHS", "40"))
+PACK_MAX_PARAGRAPH_CHARS = 400  # 이보다 긴 문단은 단독 요청
+
+# 단계별 동시 LLM 호출 상한 (단계 사이 흐름이 막히지 않도록 각각 제한)
+# 예: STAGE_CONCURRENCY="translate=6,edit=4,restructure=2"
+STAGE_CONCURRENCY = {
+    "translate": 4,
+    "edit": 4,
+    "advanced_edit": 4,
+    "fused": 4,
+    "restructure": 2,
+}
+for _item in os.getenv("STAGE_CONCURRENCY", "").split(","):
+    if "=" in _item:
+        _stage, _limit = _item.split("=", 1)
+        STAGE_CONCURRENCY[_stage.strip()] = max(1, int(_limit))
+
+_STAGE_SLOTS = {
+    stage: threading.BoundedSemaphore(limit)
+    for stage, limit in STAGE_CONCURRENCY.items()
+}
+
+# 문단 리듬 단계 창 크기 (문자 수): 번역이 끝난 앞부분부터 바로 재구성 시작
+# 0(기본)이면 전체 텍스트를 한 번에 처리 (기존 동작)
+# 창 경계에서는 대사/서술 짝짓기와 문단 에디터 문맥이 끊기고, 결과가 iter_translate_text /
+# translate_text_incremental / --stream 경로와 달라지므로 켤 때 주의
+RESTRUCTURE_WINDOW_CHARS = int(os.getenv("RESTRUCTURE_WINDOW_CHARS", "0"))
+
+# 복원되지 않은 placeholder가 남은 문단 재요청 횟수 (해당 문단만)
+RESTORE_RETRIES = 1
+
+# translate_text_multi: 동시에 진행할 대상 언어 수
+MULTI_TARGET_CONCURRENCY = int(os.getenv("MULTI_TARGET_CONCURRENCY", "4"))
+
 # ===============================
 # 🔒 IMMUTABLE RULES (불변 규칙)
 # ===============================
@@ -38,6 +95,31 @@ IMMUTABLE RULES:
 # ===============================
 # 🔒 STAGE 1: TRANSLATION PROMPT (언어 중립)
 # ===============================
+# 번역 규칙 (번역 단계 / 통합 단계 공용)
+TRANSLATION_RULES = """
+STRICT RULES:
+- Do NOT summarize, omit, or add content.
+- Do NOT change sentence order.
+- Translate EVERYTHING, including narration and dialogue.
+- Numeric-only or symbol-heavy lines must remain unchanged.
+
+STYLE GUIDELINES:
+- Translate as if the text had originally been drafted in the TARGET LANGUAGE,
+  WITHOUT changing meaning, plot, or character intent.
+- Prefer clarity and natural language over literal structure.
+- Do NOT preserve source-language word order or particles.
+- Do NOT add uncertainty, hedging, or self-distancing
+  unless explicitly present in the source text.
+""".strip()
+
+DIALOGUE_LOCALIZATION = """
+DIALOGUE LOCALIZATION:
+- Formal speech → Professional but approachable tone.
+- Polite speech → Standard friendly dialogue.
+- Casual speech → Natural casual language.
+- Do NOT introduce slang or contractions not present in the source.
+""".strip()
+
 TRANSLATION_PROMPT = f"""
 You are a PROFESSIONAL COMMERCIAL WEB NOVEL TRANSLATOR
 working for a global web novel distribution platform.
@@ -52,19 +134,7 @@ TRANSLATION PURPOSE:
 - The goal is SAFE, READABLE, SELLABLE quality.
 - Literary brilliance is NOT required.
 
-STRICT RULES:
-- Do NOT summarize, omit, or add content.
-- Do NOT change sentence order.
-- Translate EVERYTHING, including narration and dialogue.
-- Numeric-only or symbol-heavy lines must remain unchanged.
-
-STYLE GUIDELINES:
-- Translate as if the text had originally been drafted in the TARGET LANGUAGE,
-  WITHOUT changing meaning, plot, or character intent.
-- Prefer clarity and natural language over literal structure.
-- Do NOT preserve source-language word order or particles.
-- Do NOT add uncertainty, hedging, or self-distancing
-  unless explicitly present in the source text.
+{TRANSLATION_RULES}
 
 STRUCTURE GUIDELINES:
 - You MAY adjust paragraph breaks to improve web novel readability.
@@ -76,11 +146,7 @@ STRUCTURE GUIDELINES:
 - Consecutive narration sentences may be grouped into longer paragraphs
   if it improves reading flow.
 
-DIALOGUE LOCALIZATION:
-- Formal speech → Professional but approachable tone.
-- Polite speech → Standard friendly dialogue.
-- Casual speech → Natural casual language.
-- Do NOT introduce slang or contractions not present in the source.
+{DIALOGUE_LOCALIZATION}
 
 TECHNICAL CONSTRAINTS:
 - Placeholders such as __ENTITY_x__ represent locked proper nouns.
@@ -95,6 +161,20 @@ OUTPUT:
 # ===============================
 # 🔍 STAGE 2: EDITOR PROMPT (공통)
 # ===============================
+# 편집 규칙 (편집 단계 / 통합 단계 공용)
+EDITOR_RULES = """
+NORMALIZE ONLY IF PRESENT:
+- Passive constructions → Active voice (where natural).
+- Repetitive sentence starters → Varied but neutral structure.
+- Overly stiff or mechanical phrasing → Common, natural language.
+- Self-hedging expressions that weaken narrative confidence.
+
+SIMPLIFY ONLY IF PRESENT:
+- 'seemed to' + verb → Direct verb (unless uncertainty is explicit).
+- 'appeared to' + verb → Direct verb.
+- Multiple descriptors → Strongest single descriptor.
+""".strip()
+
 EDITOR_PROMPT = f"""
 You are a PROFESSIONAL PLATFORM FICTION EDITOR
 preparing a translated web novel for paid release.
@@ -110,16 +190,7 @@ STRICT CONSTRAINTS:
 - Do NOT touch placeholders such as __ENTITY_x__.
 - Do NOT translate content; editing only.
 
-NORMALIZE ONLY IF PRESENT:
-- Passive constructions → Active voice (where natural).
-- Repetitive sentence starters → Varied but neutral structure.
-- Overly stiff or mechanical phrasing → Common, natural language.
-- Self-hedging expressions that weaken narrative confidence.
-
-SIMPLIFY ONLY IF PRESENT:
-- 'seemed to' + verb → Direct verb (unless uncertainty is explicit).
-- 'appeared to' + verb → Direct verb.
-- Multiple descriptors → Strongest single descriptor.
+{EDITOR_RULES}
 
 {IMMUTABLE_RULES}
 
@@ -127,6 +198,18 @@ OUTPUT:
 - Output ONLY the revised text.
 """.strip()
 
+# ===============================
+# 📦 PACKED PARAGRAPHS PROMPT (여러 문단 1회 요청)
+# ===============================
+PACKED_PARAGRAPHS_PROMPT = """
+PACKED INPUT:
+- The input contains several independent paragraphs.
+- Each paragraph starts with a marker line such as [[P1]], [[P2]], ...
+- Output EVERY marker exactly as given, on its own line, in the same order.
+- Put the result for each paragraph directly below its marker.
+- Do NOT merge, split, reorder, add, or drop paragraphs or markers.
+""".strip()
+
 # ===============================
 # 🔤 언어 코드 → 언어명 매핑
 # ===============================
@@ -141,65 +224,368 @@ LANGUAGE_NAMES = {
     "pt": "Portuguese",
     "id": "Indonesian",
 }
+_LANGUAGE_CODES = {name: code for code, name in LANGUAGE_NAMES.items()}
 
 # ===============================
 # 내부용: 텍스트 분할
 # ===============================
-def _split_text(text: str, max_chars: int = 2000):
+def _split_text(text: str, source_language: str = "ko", target_language: str = None):
     """
-    원본 텍스트를 청크로 분할
+    긴 문단을 토큰 예산 기준 청크로 분할 (문단 내부 기술 처리용)
     
     원칙:
     - 시스템은 문단을 '이해'하지 않음
-    - 단지 원본 문자열의 \n\n을 기술적 분할의 최소 단위로 존중
-    - 문단 경계(\n\n)에서만 청크 분할
-    - 문단 중간에서 청크를 끊지 않음
+    - 줄 경계(\n)에서만 분할, 줄 중간에서 끊지 않음
+    - 입력 + 예상 출력 토큰이 TRANSLATION_TOKEN_BUDGET 이하가 되도록 묶음
+      (한글/한자처럼 토큰 밀도가 높은 언어는 더 작은 청크)
     """
-    chunks = []
-    buffer = ""
+    return plan_chunks(text, source_language, target_language, separator="\n")
 
-    # 원본 문자열의 \n\n 기준으로 분리
-    paragraphs = text.split("\n\n")
+# ===============================
+# 내부용: 번역 불필요 문단 (LLM 생략)
+# ===============================
+def _needs_no_translation(text: str) -> bool:
+    """
+    글자(문자/결합 기호)가 하나도 없는 문단인지 판별
+    - 장면 구분선 (***, ―――, ◆◇◆), 말줄임표 (……, ...)
+    - 시스템 창 틀 ([ ], 【 】, ┌──┐), 숫자만 있는 줄
+    - placeholder만 있는 문단 (토큰 제거 후 기호/공백만 남는 경우)
+    """
+    stripped = PLACEHOLDER_RE.sub("", text)
+    return all(
+        ch.isspace() or unicodedata.category(ch)[0] in "PSNZ"
+        for ch in stripped
+    )
+
+
+def _passthrough(para: str, entities: dict, target_language: str, source_language: str = "ko"):
+    """
+    번역 불필요 문단이면 LLM 없이 결과 반환 (placeholder는 바로 복원), 아니면 None
+    """
+    if not para.strip():
+        return None
+
+    replaced_text, mapping = apply_placeholders(para, entities, source_language=source_language)
+    if not _needs_no_translation(replaced_text):
+        return None
+
+    print(f"[DEBUG-SKIP] No translation needed: {para[:50]}")
+    return restore_placeholders(replaced_text, mapping, entities, target_language)
+
+
+# ===============================
+# 내부용: 문단 묶음(packing)
+# ===============================
+_PACK_MARKER_RE = re.compile(r"^\[\[P(\d+)\]\][ \t]*$", re.MULTILINE)
+
+
+def _with_packing(messages: list, packed: bool) -> list:
+    """
+    묶음 요청이면 user 메시지 앞에 PACKED_PARAGRAPHS_PROMPT 추가
+    """
+    if not packed:
+        return messages
+    return messages[:-1] + [{"role": "system", "content": PACKED_PARAGRAPHS_PROMPT}] + messages[-1:]
+
+
+def _plan_units(paragraphs: list, source_language: str = "ko", target_language: str = None) -> list:
+    """
+    문단 목록 → 번역 단위(문단 인덱스 목록) 목록
+
+    - 짧은 문단(PACK_MAX_PARAGRAPH_CHARS 이하)은 연속된 것끼리
+      PACK_TOKEN_BUDGET / PACK_MAX_PARAGRAPHS 안에서 하나로 묶음
+      (언어쌍 기준 입력 예산 input_budget()도 넘지 않도록)
+    - 빈 문단, 긴 문단은 단독 단위
+    """
+    if not PARAGRAPH_PACKING:
+        return [[i] for i in range(len(paragraphs))]
+
+    budget = min(PACK_TOKEN_BUDGET, input_budget(source_language, target_language))
+    units = []
+    run = []  # 연속된 짧은 문단 인덱스
+
+    def flush():
+        if run:
+            units.extend(pack_units(run, budget, max_units=PACK_MAX_PARAGRAPHS, text_of=paragraphs.__getitem__))
+            run.clear()
+
+    for i, para in enumerate(paragraphs):
+        if not para.strip() or len(para) > PACK_MAX_PARAGRAPH_CHARS:
+            flush()
+            units.append([i])
+        else:
+            run.append(i)
+
+    flush()
+    return units
+
+
+def _pack(paragraphs: list) -> str:
+    return "\n\n".join(f"[[P{i + 1}]]\n{para.strip()}" for i, para in enumerate(paragraphs))
 
+
+def _unpack(text: str, count: int):
+    """
+    묶음 응답 → 문단별 결과 목록
+    마커 누락/중복/순서 변경/빈 결과가 있으면 None
+    """
+    markers = list(_PACK_MARKER_RE.finditer(text))
+    if [int(m.group(1)) for m in markers] != list(range(1, count + 1)):
+        return None
+    if text[:markers[0].start()].strip():
+        return None
+
+    results = []
+    for n, marker in enumerate(markers):
+        end = markers[n + 1].start() if n + 1 < len(markers) else len(text)
+        segment = text[marker.end():end].strip()
+        if not segment:
+            return None
+        results.append(segment)
+    return results
+
+
+def _translate_packed(
+    paragraphs: list,
+    entities: dict,
+    source_lang_name: str,
+    target_lang_name: str,
+    target_language: str,
+):
+    """
+    짧은 문단 여러 개를 마커로 묶어 단계별 1회 요청으로 번역
+    - 묶음 구조가 깨지면 None (호출부에서 전체를 문단 단위로 재시도)
+    - 분리 후 문단별 검증에 실패한 문단만 None으로 채워 반환 (호출부에서 그 문단만 재요청)
+    """
+    source_language = _LANGUAGE_CODES.get(source_lang_name, "ko")
+    replaced = []
+    mappings = []
+    mapping = {}
+    context = "\n\n".join(paragraphs)  # 묶음 전체 기준 충돌 검사
     for para in paragraphs:
-        # 문단이 max_chars를 초과하면 단독 청크로
-        if len(para) > max_chars:
-            # buffer가 있으면 먼저 저장
-            if buffer.strip():
-                chunks.append(buffer.rstrip("\n\n"))
-                buffer = ""
-            # 긴 문단은 단독 청크
-            chunks.append(para)
+        # 묶음 안에서 토큰 번호가 겹치지 않도록 이어서 번호 부여
+        replaced_text, para_mapping = apply_placeholders(
+            para, entities, len(mapping) + 1, context, source_language
+        )
+        replaced.append(replaced_text)
+        mappings.append(para_mapping)
+        mapping.update(para_mapping)
+
+    packed_text = _pack(replaced)
+    print(f"[DEBUG-PACK] Packed {len(paragraphs)} paragraphs ({len(packed_text)} chars)")
+
+    _preview_begin(mapping)
+    try:
+        edited = _run_stages(
+            packed_text, source_lang_name, target_lang_name, target_language, packed=True, label="DEBUG-PACK"
+        )
+    except OutputValidationError as e:
+        print(f"[DEBUG-PACK] {e}, falling back to per-paragraph calls")
+        return None
+    _preview_end(edited)
+
+    segments = _unpack(edited, len(paragraphs))
+    if segments is None:
+        print(f"[DEBUG-PACK] Split validation failed, falling back to per-paragraph calls")
+        return None
+
+    results = []
+    for para_source, para_mapping, seg in zip(replaced, mappings, segments):
+        issues = check_output(para_source, seg, source_language, target_language, para_mapping)
+        if issues:
+            print(f"[DEBUG-PACK] ⚠️ Paragraph failed validation ({'; '.join(issues)}), re-requesting it alone")
+            results.append(None)
             continue
-        
-        # 문단을 buffer에 추가 시도
-        test_buffer = buffer + para + "\n\n"
-        
-        if len(test_buffer) > max_chars:
-            # buffer 저장
-            if buffer.strip():
-                chunks.append(buffer.rstrip("\n\n"))
-            # 새 buffer 시작
-            buffer = para + "\n\n"
+        restored, unrecovered = restore_placeholders_checked(seg, para_mapping, entities, target_language)
+        if unrecovered:
+            print(f"[DEBUG-PACK] ⚠️ Unrecovered placeholders {unrecovered}, re-requesting this paragraph alone")
+            results.append(None)
         else:
-            buffer = test_buffer
+            results.append(restored)
+    return results
+
+
+# ===============================
+# 내부용: 최종 단계 미리보기 (스트리밍 조각을 도착하는 대로 전달)
+# ===============================
+# 출력 끝부분 중 아직 확정할 수 없는 부분 (잘린 placeholder/묶음 마커, 공백)
+_PREVIEW_HOLD_RE = re.compile(r"\s*(?:_[A-Za-z0-9_]{0,48}|\[\[?P?\d*\]?\]?)?\s*$")
+_PREVIEW_MARKER_RE = re.compile(r"^\[\[P\d+\]\][ \t]*\n?", re.MULTILINE)
+
+_preview = threading.local()
+
 
-    # 남은 buffer 저장
-    if buffer.strip():
-        chunks.append(buffer.rstrip("\n\n"))
+class _UnitPreview:
+    """
+    번역 단위 1개의 최종 단계 출력을 on_delta(unit, text)로 전달
+    - placeholder는 복원, 묶음 마커는 제거해서 전달
+    - 재시도/캐시 적중 등으로 이미 보낸 조각이 무효가 되면 on_delta(unit, None) 후 다시 전달
+    - 미리보기일 뿐, 확정 결과는 _iter_paragraphs가 yield하는 문단
+    """
 
-    return chunks
+    def __init__(self, unit: list, on_delta, entities: dict, target_language: str):
+        self.unit = unit
+        self.on_delta = on_delta
+        self.entities = entities
+        self.target_language = target_language
+        self.stage = None  # 미리보기를 보낼 단계 (_run_stages가 최종 단계로 설정)
+        self.committed = ""  # 끝난 호출들의 결과
+        self.begin({})
+
+    def begin(self, mapping: dict, separator: str = "\n\n"):
+        self.mapping = mapping
+        self.separator = separator if self.committed else ""
+        self.pending_separator = self.separator
+        self.raw = ""
+        self.sent = 0
+
+    def _render(self, raw: str) -> str:
+        text = _PREVIEW_MARKER_RE.sub("", raw)
+        return restore_placeholders(text, self.mapping, self.entities, self.target_language)
+
+    def _send(self, raw: str):
+        text = self._render(raw)
+        if text:
+            self.on_delta(self.unit, self.pending_separator + text)
+            self.pending_separator = ""
+
+    def _resend(self):
+        self.on_delta(self.unit, None)
+        if self.committed:
+            self.on_delta(self.unit, self.committed)
+        self.pending_separator = self.separator
+
+    def delta(self, piece):
+        if piece is None:
+            # 스트림 중단 후 재시도: 이번 호출에서 보낸 조각 무효
+            self.raw = ""
+            self.sent = 0
+            self._resend()
+            return
+
+        self.raw += piece
+        text = self.raw.lstrip()
+        end = _PREVIEW_HOLD_RE.search(text, self.sent).start()
+        if end > self.sent:
+            self._send(text[self.sent:end])
+            self.sent = end
+
+    def end(self, final_raw: str):
+        sent = self.raw.lstrip()[:self.sent]
+        if final_raw.startswith(sent):
+            self._send(final_raw[len(sent):])
+        else:
+            self._resend()
+            self._send(final_raw)
+        self.committed += self.separator + self._render(final_raw)
+
+    def discard(self):
+        # 이번 호출 결과를 쓰지 않고 다시 요청: 보낸 조각 무효
+        self.raw = ""
+        self.sent = 0
+        self._resend()
+
+    def clear(self):
+        self.committed = ""
+        self.on_delta(self.unit, None)
+
+
+def _preview_begin(mapping: dict, separator: str = "\n\n"):
+    preview = getattr(_preview, "current", None)
+    if preview is not None:
+        preview.begin(mapping, separator)
+
+
+def _preview_end(final_raw: str):
+    preview = getattr(_preview, "current", None)
+    if preview is not None:
+        preview.end(final_raw)
+
+
+def _preview_discard():
+    preview = getattr(_preview, "current", None)
+    if preview is not None:
+        preview.discard()
+
+
+# ===============================
+# 내부용: LLM 호출 (단계 결과 캐시 경유)
+# ===============================
+def _complete(stage: str, model: str, messages: list, temperature: float, check=None) -> str:
+    """
+    단계별 LLM 호출 공용 경로
+    - 같은 (단계, 모델, temperature, 메시지) 조합은 translation_cache에서 재사용
+    - 실제 호출은 단계별 STAGE_CONCURRENCY 슬롯 안에서만 실행
+    - HEDGE_STAGES 단계는 p95 지연 초과 시 중복 요청(헤지)
+    - 미리보기 대상 최종 단계면 스트리밍 조각을 _UnitPreview로 전달 (헤지 단계 제외)
+    - check(output) → 문제 목록: 실패한 출력은 캐시하지 않고 VALIDATION_RETRIES회까지 재요청,
+      그래도 실패하면 OutputValidationError (마지막 출력 포함)
+    - 스트림 중단(폭주/데드라인), 비스트리밍 타임아웃도 검증 실패로 취급 (같은 재요청 횟수 안에서)
+      단, 중단 전까지 받은 출력은 쓸 수 없으므로 output=None
+    """
+    from openai import APITimeoutError  # 첫 호출 시점엔 클라이언트가 이미 로드됨 (import 지연 유지)
+
+    preview = getattr(_preview, "current", None)
+    on_delta = None
+    if preview is not None and preview.stage == stage and stage not in HEDGE_STAGES:
+        on_delta = preview.delta
+
+    def request():
+        # 폭주 중단 / 타임아웃 재시도는 아래 VALIDATION_RETRIES 하나로만 (클라이언트 재시도와 곱해지지 않도록)
+        return client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            on_delta=on_delta,
+            guard_retries=0,
+            retry_timeouts=False,
+        )
+
+    def call() -> str:
+        with _STAGE_SLOTS[stage]:
+            try:
+                res = hedged_call(stage, request)
+            except RunawayOutputError as e:
+                # 폭주/데드라인 중단: 중단 전 출력(반복, 잘린 문장)은 결과로 쓰지 않음
+                raise OutputValidationError(stage, [e.reason], None)
+            except APITimeoutError as e:
+                raise OutputValidationError(stage, [f"deadline exceeded ({e})"], None)
+        content = res.choices[0].message.content
+        usage = getattr(res, "usage", None)
+        if usage is not None:
+            # 토큰 추정 계수 보정용 (TOKEN_USAGE_LOG 설정 시에만 기록)
+            record_usage(content, getattr(usage, "completion_tokens", 0))
+        content = content.strip()
+        issues = check(content) if check else []
+        if issues:
+            raise OutputValidationError(stage, issues, content)
+        return content
+
+    for attempt in range(VALIDATION_RETRIES + 1):
+        try:
+            return translation_cache.cached_call(stage, model, temperature, messages, call)
+        except OutputValidationError as e:
+            if attempt == VALIDATION_RETRIES:
+                raise
+            print(f"[VALIDATION] {e}, retry {attempt + 1}/{VALIDATION_RETRIES}")
 
 # ===============================
 # 내부용: 1단계 번역
 # ===============================
-def _translate_block(text: str, source_language: str, target_language: str) -> str:
+def _translate_block(
+    text: str,
+    source_language: str,
+    target_language: str,
+    packed: bool = False,
+    check=None,
+) -> str:
     if not text.strip():
         return text
 
-    res = client.chat.completions.create(
+    return _complete(
+        "translate",
         model=MODEL,
-        messages=[
+        messages=_with_packing([
             {
                 "role": "system",
                 "content": (
@@ -218,22 +604,22 @@ def _translate_block(text: str, source_language: str, target_language: str) -> s
                 "role": "user",
                 "content": text
             },
-        ],
+        ], packed),
         temperature=0.3,
+        check=check,
     )
 
-    return res.choices[0].message.content.strip()
-
 # ===============================
 # 내부용: 2단계 편집
 # ===============================
-def _edit_block(text: str, target_language: str) -> str:
+def _edit_block(text: str, target_language: str, packed: bool = False, check=None) -> str:
     if not text.strip():
         return text
 
-    res = client.chat.completions.create(
+    return _complete(
+        "edit",
         model="gpt-4omini",  # Azure deployment name
-        messages=[
+        messages=_with_packing([
             {
                 "role": "system",
                 "content": (
@@ -244,64 +630,253 @@ def _edit_block(text: str, target_language: str) -> str:
                 )
             },
             {"role": "user", "content": text},
-        ],
+        ], packed),
         temperature=0.4,
+        check=check,
     )
 
-    return res.choices[0].message.content.strip()
-
 # ===============================
 # 내부용: 3단계 고급 에디터 (EN / JA / ZH)
 # ===============================
-def _advanced_editor(text: str, language: str) -> str:
-    if not text.strip():
-        return text
+# 언어별 다듬기 규칙 (고급 에디터 / 통합 단계 공용 - 역할/언어 지정 문장 제외)
+ADVANCED_POLISH_RULES = {
+    "en": (
+        "Improve naturalness and readability for commercial publication.\n"
+        "Do NOT change meaning, plot, or tone.\n"
+        "Do NOT add or remove content.\n"
+    ),
+    "ja": (
+        "自然で商業作品として通用する日本語に整えてください。\n"
+        "意味・展開・文量は絶対に変更しないでください。\n"
+        "省略・要約・再解釈は禁止です。\n"
+    ),
+    "zh": "禁止删减内容、禁止概括总结、禁止改变结构。\n",
+}
 
-    if language == "en":
-        system_prompt = (
-            "You are a professional English web novel editor.\n"
-            "The text language is English.\n"
-            "You MUST keep the output in English.\n"
-            "Improve naturalness and readability for commercial publication.\n"
-            "Do NOT change meaning, plot, or tone.\n"
-            "Do NOT add or remove content.\n"
-            f"{IMMUTABLE_RULES}"
-        )
+# 고급 에디터 역할/언어 지정 문장 (단독 편집 단계 전용: 입력이 이미 대상 언어)
+_ADVANCED_EDITOR_ROLES = {
+    "en": (
+        "You are a professional English web novel editor.\n"
+        "The text language is English.\n"
+        "You MUST keep the output in English.\n"
+    ),
+    "ja": (
+        "You are a professional Japanese web novel editor.\n"
+        "The text language is Japanese.\n"
+        "You MUST keep the output in Japanese.\n"
+    ),
+    "zh": (
+        "You are a professional Chinese web novel editor.\n"
+        "The text language is Chinese (Simplified).\n"
+        "You MUST keep the output in Chinese (Simplified).\n"
+        "这是已经完成翻译的中文正文，请进行润色而不是改写。\n"
+    ),
+}
 
-    elif language == "ja":
-        system_prompt = (
-            "You are a professional Japanese web novel editor.\n"
-            "The text language is Japanese.\n"
-            "You MUST keep the output in Japanese.\n"
-            "自然で商業作品として通用する日本語に整えてください。\n"
-            "意味・展開・文量は絶対に変更しないでください。\n"
-            "省略・要約・再解釈は禁止です。\n"
-            f"{IMMUTABLE_RULES}"
-        )
 
-    elif language == "zh":
-        system_prompt = (
-            "You are a professional Chinese web novel editor.\n"
-            "The text language is Chinese (Simplified).\n"
-            "You MUST keep the output in Chinese (Simplified).\n"
-            "这是已经完成翻译的中文正文，请进行润色而不是改写。\n"
-            "禁止删减内容、禁止概括总结、禁止改变结构。\n"
-            f"{IMMUTABLE_RULES}"
-        )
+def _advanced_editor_prompt(language: str):
+    """
+    언어별 고급 에디터 system prompt (대상 언어가 아니면 None)
+    """
+    if language not in ADVANCED_POLISH_RULES:
+        return None
+    return _ADVANCED_EDITOR_ROLES[language] + ADVANCED_POLISH_RULES[language] + IMMUTABLE_RULES
 
-    else:
+
+def _advanced_editor(text: str, language: str, packed: bool = False, check=None) -> str:
+    if not text.strip():
         return text
 
-    res = client.chat.completions.create(
+    system_prompt = _advanced_editor_prompt(language)
+    if system_prompt is None:
+        return text
+
+    return _complete(
+        "advanced_edit",
         model=MODEL,
-        messages=[
+        messages=_with_packing([
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": text},
-        ],
+        ], packed),
         temperature=0.35,
+        check=check,
+    )
+
+# ===============================
+# 내부용: 통합(fused) 단계 - 번역+편집+고급 편집 1회 호출
+# ===============================
+def _use_fused(target_language: str) -> bool:
+    """
+    FUSED_STAGE_LANGUAGES: "all" 또는 "es,fr,de" 형태 (기본: 비활성 → 3단계)
+    """
+    return "all" in FUSED_STAGE_LANGUAGES or target_language in FUSED_STAGE_LANGUAGES
+
+
+def _fused_prompt(target_language: str) -> str:
+    """
+    통합 단계 전용 system prompt
+    번역 규칙 + 편집 규칙 + 언어별 다듬기 규칙 (각 단계의 역할/언어 지정 문장과 OUTPUT은 제외),
+    문단 구조 규칙과 OUTPUT은 1번만
+    """
+    sections = [
+        "You are a PROFESSIONAL COMMERCIAL WEB NOVEL TRANSLATOR AND EDITOR\n"
+        "working for a global web novel distribution platform.\n"
+        "In ONE pass, translate the input from the SOURCE LANGUAGE into the TARGET LANGUAGE,\n"
+        "then edit and polish your translation before output.\n"
+        "The input is NOT translated yet; translate ALL of it.",
+        TRANSLATION_RULES,
+        DIALOGUE_LOCALIZATION,
+        "STRUCTURE:\n"
+        "- Do NOT change paragraph breaks or line order.\n"
+        "- Do NOT merge dialogue with narration.",
+        "EDIT YOUR TRANSLATION:\n" + EDITOR_RULES,
+    ]
+
+    polish = ADVANCED_POLISH_RULES.get(target_language)
+    if polish:
+        sections.append("FINAL POLISH:\n" + polish.strip())
+
+    sections += [
+        "TECHNICAL CONSTRAINTS:\n"
+        "- Placeholders such as __ENTITY_x__ represent locked proper nouns.\n"
+        "- NEVER translate, modify, remove, or reformat placeholders.",
+        IMMUTABLE_RULES,
+        "OUTPUT:\n- Output ONLY the final edited translation in the TARGET LANGUAGE.",
+    ]
+    return "\n\n".join(sections)
+
+
+def _translate_fused(
+    text: str,
+    source_language: str,
+    target_language: str,
+    language_code: str,
+    packed: bool = False,
+    check=None,
+) -> str:
+    if not text.strip():
+        return text
+
+    return _complete(
+        "fused",
+        model=MODEL,
+        messages=_with_packing([
+            {
+                "role": "system",
+                "content": (
+                    f"SOURCE LANGUAGE: {source_language}\n"
+                    f"TARGET LANGUAGE: {target_language}\n"
+                    f"The input text is written entirely in {source_language}.\n"
+                    f"You MUST translate it into {target_language}.\n"
+                    f"Output MUST be written ONLY in {target_language}."
+                )
+            },
+            {
+                "role": "system",
+                "content": _fused_prompt(language_code)
+            },
+            {
+                "role": "user",
+                "content": text
+            },
+        ], packed),
+        temperature=0.3,
+        check=check,
+    )
+
+
+def _stage_check(source: str, source_language: str, target_language: str, packed: bool, mapping: dict = None):
+    """
+    단계 입력 source 기준 출력 검증 함수
+    - 묶음: 마커 구조만 확인 (문단별 내용 검증은 _translate_packed에서 분리 후 수행)
+    - 단독: placeholder / 대상 언어 문자 / 길이 비율 (validation.check_output)
+    """
+    if packed:
+        count = len(_PACK_MARKER_RE.findall(source))
+        return lambda output: [] if _unpack(output, count) is not None else ["pack markers lost"]
+    placeholders = list(mapping) if mapping is not None else None
+    return lambda output: check_output(source, output, source_language, target_language, placeholders)
+
+
+def _run_checked(call, fallback: str = None, packed: bool = False, label: str = "DEBUG") -> str:
+    """
+    단계 실행, 재요청 후에도 검증 실패 시
+    - 편집 단계 (fallback = 단계 입력): 편집 생략하고 입력 유지
+    - 묶음 번역: 그대로 raise (호출부에서 문단 단위로 재요청)
+    - 단독 번역: 마지막 출력 사용 (경고만 남김), 쓸 수 있는 출력이 없으면 (스트림 중단/타임아웃) raise
+    """
+    try:
+        return call()
+    except OutputValidationError as e:
+        if fallback is not None:
+            print(f"[{label}] ⚠️ {e}, keeping previous stage output")
+            return fallback
+        if packed or not e.output:
+            raise
+        print(f"[{label}] ⚠️ {e}, using last output")
+        return e.output
+
+
+def _run_stages(
+    text: str,
+    source_lang_name: str,
+    target_lang_name: str,
+    target_language: str,
+    packed: bool = False,
+    label: str = "DEBUG",
+    mapping: dict = None,
+) -> str:
+    """
+    placeholder 치환된 텍스트 → 최종 편집본
+    - 기본: 번역 → 편집 → 고급 편집 (3단계)
+    - FUSED_STAGE_LANGUAGES 대상 언어: 통합 1회 호출
+    - 단계마다 출력 검증 (mapping: apply_placeholders 매핑)
+    """
+    source_language = _LANGUAGE_CODES.get(source_lang_name, "ko")
+
+    preview = getattr(_preview, "current", None)
+    if preview is not None:
+        if _use_fused(target_language):
+            preview.stage = "fused"
+        elif _advanced_editor_prompt(target_language):
+            preview.stage = "advanced_edit"
+        else:
+            preview.stage = "edit"
+
+    if _use_fused(target_language):
+        check = _stage_check(text, source_language, target_language, packed, mapping)
+        fused = _run_checked(
+            lambda: _translate_fused(text, source_lang_name, target_lang_name, target_language, packed, check),
+            packed=packed,
+            label=label,
+        )
+        print(f"[{label}] After fused translate+edit: {fused[:100]}...")
+        return fused
+
+    check = _stage_check(text, source_language, target_language, packed, mapping)
+    translated = _run_checked(
+        lambda: _translate_block(text, source_lang_name, target_lang_name, packed, check),
+        packed=packed,
+        label=label,
     )
+    print(f"[{label}] After translate: {translated[:100]}...")
 
-    return res.choices[0].message.content.strip()
+    check = _stage_check(translated, target_language, target_language, packed, mapping)
+    edited = _run_checked(
+        lambda: _edit_block(translated, target_lang_name, packed, check),
+        fallback=translated,
+        label=label,
+    )
+    print(f"[{label}] After edit: {edited[:100]}...")
+
+    check = _stage_check(edited, target_language, target_language, packed, mapping)
+    polished = _run_checked(
+        lambda: _advanced_editor(edited, target_language, packed, check),
+        fallback=edited,
+        label=label,
+    )
+    print(f"[{label}] After advanced_editor: {polished[:100]}...")
+    return polished
 
 # ===============================
 # 블록 구조 처리 (가독성 향상)
@@ -408,14 +983,379 @@ def _process_structure(text: str) -> str:
     return result
 
 
+# ===============================
+# 내부용: 문단 단위 번역
+# ===============================
+def _translate_unit(
+    text: str,
+    entities: dict,
+    source_lang_name: str,
+    target_lang_name: str,
+    target_language: str,
+    label: str = "DEBUG",
+    preview_separator: str = "\n\n",
+) -> str:
+    """
+    placeholder 치환 → 번역 → 편집 → 고급 편집 (또는 통합 단계) → 복원 (1개 단위)
+    preview_separator: 미리보기에서 같은 단위의 앞 결과와 이어 붙일 구분자
+    """
+    replaced_text, mapping = apply_placeholders(
+        text, entities, source_language=_LANGUAGE_CODES.get(source_lang_name, "ko")
+    )
+    print(f"[{label}] Original: {text[:100]}...")
+    print(f"[{label}] After placeholder: {replaced_text[:100]}...")
+    print(f"[{label}] Mapping: {mapping}")
+
+    for attempt in range(RESTORE_RETRIES + 1):
+        _preview_begin(mapping, preview_separator)
+        edited = _run_stages(
+            replaced_text, source_lang_name, target_lang_name, target_language, label=label, mapping=mapping
+        )
+        restored, unrecovered = restore_placeholders_checked(edited, mapping, entities, target_language)
+        if not unrecovered:
+            break
+        if attempt == RESTORE_RETRIES:
+            print(f"[{label}] ⚠️ Unrecovered placeholders {unrecovered} after {RESTORE_RETRIES} re-request(s)")
+            break
+        print(f"[{label}] ⚠️ Unrecovered placeholders {unrecovered}, re-requesting ({attempt + 1}/{RESTORE_RETRIES})")
+        _preview_discard()
+    _preview_end(edited)
+
+    print(f"[{label}] After restore: {restored[:100]}...")
+    return restored
+
+
+def _translate_paragraph(
+    para: str,
+    entities: dict,
+    source_lang_name: str,
+    target_lang_name: str,
+    target_language: str,
+    source_language: str = "ko",
+) -> str:
+    """
+    문단 1개 번역 (출력도 반드시 문단 1개)
+    """
+    if not para.strip():
+        return para
+
+    # 문단 토큰 수에 따른 처리 분기 (입력 + 예상 출력이 예산 이내인지)
+    if estimate_tokens(para) <= input_budget(source_language, target_language):
+        # 짧은 문단: 직접 번역
+        return _translate_unit(para, entities, source_lang_name, target_lang_name, target_language)
+
+    # 긴 문단: 내부 청크 분할 → 번역 → 단일 문단으로 복원
+    # 🔒 주의: 이 분할은 문단 내부 기술 처리용이며,
+    #          출력에서는 반드시 하나의 문단으로 복원됨
+    chunks = _split_text(para, source_language, target_language)
+    chunk_results = []
+
+    for i, chunk in enumerate(chunks):
+        chunk_results.append(
+            _translate_unit(
+                chunk,
+                entities,
+                source_lang_name,
+                target_lang_name,
+                target_language,
+                label=f"DEBUG-CHUNK {i+1}",
+                preview_separator="\n" if i else "\n\n",
+            )
+        )
+
+    # 🔒 중요: \n으로만 연결 (문단 내부이므로 \n\n 아님)
+    return "\n".join(chunk_results)
+
+
+def finalize_paragraphs(translated_paragraphs: list, target_language: str) -> str:
+    """
+    번역된 문단 목록 → 최종 출력 (구조 처리 + 언어별 문단 리듬)
+    iter_translate_text() 사용처에서도 호출
+    """
+    # 🔒 문단 복원: 원본과 동일한 문단 경계(\n\n)로 연결
+    final_text = "\n\n".join(translated_paragraphs)
+    
+    # 구조 처리 (기존 로직 유지)
+    structured_text = _process_structure(final_text)
+    
+    # 언어별 후처리 (GPT 설계 - 2단계 문단 리듬 시스템)
+    # 각 언어별 웹소설 플랫폼 표준에 맞춰 문단 리듬 조정
+    
+    print(f"[DEBUG] Starting paragraph restructuring for language: {target_language}")
+    
+    with _STAGE_SLOTS["restructure"]:
+        structured_text = restructure_paragraphs(structured_text, target_language)
+    
+    # 기타 언어: 기본 구조 처리만 적용
+    
+    print(f"[DEBUG] Paragraph restructuring finished. Returning result.")
+    return structured_text
+
+
+def _iter_paragraphs(
+    paragraphs: list,
+    entities: dict,
+    source_language: str,
+    target_language: str,
+    max_in_flight: int = None,
+    on_delta=None,
+    on_paragraph=None,
+):
+    """
+    문단별 번역 결과를 원문 순서대로 yield
+    yield: (paragraph_index, translated_text, stats)
+
+    - 짧은 문단은 _plan_units()에 따라 묶어서 1회 요청으로 번역
+    - 최대 max_in_flight(기본 PARAGRAPH_CONCURRENCY)개 단위를 동시에 번역
+    - 완료 순서와 무관하게 항상 원문 순서로 yield (문단 수 보존)
+    - on_delta(unit, text): 단위별 최종 단계 미리보기 (_UnitPreview, 작업 스레드에서 호출)
+    - on_paragraph(index, text): 문단 완료 즉시 호출 (yield 순서와 무관, 작업 스레드에서 호출)
+    """
+    source_lang_name = LANGUAGE_NAMES.get(source_language, "Korean")
+    target_lang_name = LANGUAGE_NAMES.get(target_language, "English")
+    max_in_flight = max(1, max_in_flight or PARAGRAPH_CONCURRENCY)
+
+    def translate_one(para: str):
+        return _translate_paragraph(
+            para, entities, source_lang_name, target_lang_name, target_language, source_language
+        )
+
+    def run(unit: list) -> list:
+        """
+        단위 1개 번역 → [(translated, stats), ...] (unit 순서)
+        """
+        if on_delta is None:
+            results = translate(unit)
+        else:
+            _preview.current = _UnitPreview(unit, on_delta, entities, target_language)
+            try:
+                results = translate(unit)
+            finally:
+                _preview.current = None
+
+        if on_paragraph is not None:
+            for index, (translated, _) in zip(unit, results):
+                on_paragraph(index, translated)
+        return results
+
+    def translate(unit: list) -> list:
+        started = time.perf_counter()
+        unit_paragraphs = [paragraphs[i] for i in unit]
+
+        # 번역 불필요 문단은 LLM 없이 통과
+        results = [_passthrough(para, entities, target_language, source_language) for para in unit_paragraphs]
+        skipped = [r is not None for r in results]
+        remaining = [k for k, r in enumerate(results) if r is None]
+
+        packed_results = None
+        if len(remaining) > 1:
+            packed_results = _translate_packed(
+                [unit_paragraphs[k] for k in remaining],
+                entities, source_lang_name, target_lang_name, target_language,
+            )
+        if packed_results is not None:
+            for k, translated in zip(remaining, packed_results):
+                # 묶음 중 검증 실패한 문단만 단독 재요청
+                results[k] = translated if translated is not None else translate_one(unit_paragraphs[k])
+        else:
+            if len(remaining) > 1 and on_delta is not None:
+                _preview.current.clear()
+            for k in remaining:
+                results[k] = translate_one(unit_paragraphs[k])
+        packed_count = len(remaining) if packed_results is not None else 1
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return [
+            (
+                translated,
+                {
+                    "source_chars": len(para),
+                    "output_chars": len(translated),
+                    "elapsed_ms": elapsed_ms,
+                    "packed": 1 if skip else packed_count,
+                    "skipped": skip,
+                },
+            )
+            for para, translated, skip in zip(unit_paragraphs, results, skipped)
+        ]
+
+    units = _plan_units(paragraphs, source_language, target_language)
+
+    if max_in_flight == 1:
+        for unit in units:
+            for index, (translated, stats) in zip(unit, run(unit)):
+                yield index, translated, stats
+        return
+
+    # 순서 보장용 대기열: 앞 단위가 끝날 때까지 뒤 단위 결과를 보관
+    # (대기열 크기를 제한해 긴 입력에서도 메모리 일정)
+    window = deque()
+    executor = ThreadPoolExecutor(max_workers=max_in_flight)
+    try:
+        for unit in units:
+            window.append((unit, executor.submit(run, unit)))
+            if len(window) >= max_in_flight * 2:
+                done_unit, future = window.popleft()
+                for index, (translated, stats) in zip(done_unit, future.result()):
+                    yield index, translated, stats
+
+        while window:
+            done_unit, future = window.popleft()
+            for index, (translated, stats) in zip(done_unit, future.result()):
+                yield index, translated, stats
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_resumable(
+    paragraphs: list,
+    entities: dict,
+    source_language: str,
+    target_language: str,
+    max_in_flight: int = None,
+    job_id: str = None,
+):
+    """
+    _iter_paragraphs + 체크포인트
+    - job_id로 이미 완료된 문단은 체크포인트 결과를 그대로 yield (stats["resumed"] = True)
+    - 나머지 문단만 번역하고, 문단이 끝나는 즉시 체크포인트에 기록
+    """
+    hashes = [checkpoint.paragraph_hash(p, source_language, target_language) for p in paragraphs]
+    done = checkpoint.load(job_id)
+    todo = [i for i, h in enumerate(hashes) if h not in done]
+
+    if len(todo) < len(paragraphs):
+        print(f"[DEBUG] Resuming job {job_id}: {len(paragraphs) - len(todo)}/{len(paragraphs)} paragraphs from checkpoint")
+
+    translated_iter = _iter_paragraphs(
+        [paragraphs[i] for i in todo],
+        entities,
+        source_language,
+        target_language,
+        max_in_flight,
+        on_paragraph=lambda sub_index, result: checkpoint.save(job_id, hashes[todo[sub_index]], result),
+    )
+
+    for index, (para, h) in enumerate(zip(paragraphs, hashes)):
+        if h in done:
+            yield index, done[h], {
+                "source_chars": len(para),
+                "output_chars": len(done[h]),
+                "elapsed_ms": 0.0,
+                "packed": 1,
+                "skipped": False,
+                "resumed": True,
+            }
+        else:
+            _, translated, stats = next(translated_iter)
+            yield index, translated, stats
+
+
+def _translate_paragraphs(
+    paragraphs: list,
+    entities: dict,
+    source_language: str,
+    target_language: str,
+    max_in_flight: int = None,
+    job_id: str = None,
+) -> str:
+    """
+    원문 문단 목록 + 대상 언어 고유명사 (load_target_entities) → 대상 언어 최종 텍스트
+    (translate_text / translate_text_multi 공용)
+    job_id가 있으면 문단 체크포인트에서 이어서 번역
+    """
+    if job_id and checkpoint.CHECKPOINT_ENABLED:
+        paragraph_iter = _iter_resumable(
+            paragraphs, entities, source_language, target_language, max_in_flight, job_id
+        )
+    else:
+        paragraph_iter = _iter_paragraphs(paragraphs, entities, source_language, target_language, max_in_flight)
+
+    # 🔒 문단 기준 처리 (원본 구조 보존)
+    translated_paragraphs, skipped, final_text = _finalize_pipelined(paragraph_iter, target_language)
+
+    print(f"[DEBUG] Fast path: {skipped}/{len(paragraphs)} paragraphs skipped LLM ({target_language})")
+    hedges = hedge_stats()
+    if hedges:
+        print(f"[DEBUG] Hedged requests: {hedges}")
+    cache = translation_cache.cache_stats()
+    if cache:
+        print(f"[DEBUG] Stage cache: {cache}")
+
+    # 🔒 입력 문단 수 = 출력 문단 수
+    if len(translated_paragraphs) != len(paragraphs):
+        raise RuntimeError(
+            f"Paragraph count mismatch: {len(paragraphs)} in, {len(translated_paragraphs)} out"
+        )
+
+    return final_text
+
+
+def _finalize_pipelined(paragraph_iter, target_language: str):
+    """
+    번역 단계 → 문단 리듬 단계 파이프라인
+
+    원문 순서대로 도착하는 번역 문단을 RESTRUCTURE_WINDOW_CHARS 단위 창으로 모아
+    창이 찰 때마다 구조 처리 + 문단 리듬 재구성을 별도 스레드에서 바로 시작한다.
+    (뒤쪽 문단 번역과 앞쪽 창 재구성이 겹쳐 실행됨)
+    창 경계는 항상 문단 경계(\n\n)이며, 창 결과는 원래 순서대로 연결한다.
+
+    반환: (translated_paragraphs, skipped_count, final_text)
+    """
+    translated_paragraphs = []
+    skipped = 0
+
+    if RESTRUCTURE_WINDOW_CHARS <= 0:
+        for _, translated, stats in paragraph_iter:
+            translated_paragraphs.append(translated)
+            skipped += stats["skipped"]
+        return translated_paragraphs, skipped, finalize_paragraphs(translated_paragraphs, target_language)
+
+    executor = ThreadPoolExecutor(max_workers=STAGE_CONCURRENCY["restructure"])
+    futures = []
+    window = []
+    window_chars = 0
+    try:
+        for _, translated, stats in paragraph_iter:
+            translated_paragraphs.append(translated)
+            skipped += stats["skipped"]
+
+            window.append(translated)
+            window_chars += len(translated)
+            if window_chars >= RESTRUCTURE_WINDOW_CHARS:
+                futures.append(executor.submit(finalize_paragraphs, window, target_language))
+                window = []
+                window_chars = 0
+
+        if window:
+            futures.append(executor.submit(finalize_paragraphs, window, target_language))
+
+        parts = [f.result() for f in futures]
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    final_text = "\n\n".join(part for part in parts if part.strip())
+    return translated_paragraphs, skipped, final_text
+
+
 # ===============================
 # 🔥 외부 공개 함수
 # ===============================
+def _entity_job(job_id: str):
+    """
+    체크포인트 작업 ID → 고유명사 스냅샷 고정 단위
+    index.ts는 청크마다 "<작업 ID>:<청크 번호>"를 보내므로 작업 ID 부분만 사용 (청크 전체가 같은 스냅샷)
+    """
+    return job_id.split(":", 1)[0] if job_id else None
+
+
 def translate_text(
     title: str,
     text: str,
     source_language: str = "ko",
     target_language: str = "en",
+    max_in_flight: int = None,
+    job_id: str = None,
 ) -> str:
     """
     translate_text: 문단 구조 보존 전용
@@ -428,163 +1368,244 @@ def translate_text(
     
     이 함수는 문단 구조를 "보존"만 한다.
     생성·정리·개선·최적화는 하지 않는다.
+
+    max_in_flight: 동시에 번역할 문단 수 (기본 PARAGRAPH_CONCURRENCY)
+    job_id: 재시도 시 이어서 번역할 작업 ID (완료 문단을 체크포인트에 기록/재사용)
     """
     if not text.strip():
         return ""
 
-    source_lang_name = LANGUAGE_NAMES.get(source_language, "Korean")
-    target_lang_name = LANGUAGE_NAMES.get(target_language, "English")
+    entities = load_target_entities(title, target_language, _entity_job(job_id))
 
-    raw_entities = load_entities(title)
+    return _translate_paragraphs(
+        text.split("\n\n"),
+        entities,
+        source_language,
+        target_language,
+        max_in_flight,
+        job_id,
+    )
 
-    entities = {
-        k: v["translations"][target_language]
-        for k, v in raw_entities.items()
-        if (
-            isinstance(v, dict)
-            and v.get("locked") is True
-            and isinstance(v.get("translations"), dict)
-            and target_language in v["translations"]
-        )
-    }
 
-    # 🔒 문단 기준 처리 (원본 구조 보존)
-    paragraphs = text.split("\n\n")
-    translated_paragraphs = []
+def translate_text_multi(
+    title: str,
+    text: str,
+    source_language: str = "ko",
+    targets: list = None,
+    max_concurrency: int = None,
+    return_exceptions: bool = False,
+) -> dict:
+    """
+    원문 1개 → N개 언어 동시 번역
 
-    for para in paragraphs:
-        if not para.strip():
-            translated_paragraphs.append(para)
-            continue
+    - 문단 분할은 1회만 수행해 공유, 고유명사는 같은 스냅샷 버전의 언어별 entity_pack 사용
+    - 언어별 LLM 단계는 max_concurrency(기본 MULTI_TARGET_CONCURRENCY) 안에서 병렬 실행
+    - source_language와 같은 대상 언어는 원문 그대로 반환
+    - return_exceptions=True면 실패한 언어는 예외 객체로 채워 반환,
+      False면 첫 실패를 그대로 raise
+
+    반환: {target_language: translated_text}
+    """
+    targets = list(dict.fromkeys(targets or []))
+    if not targets:
+        return {}
 
-        # 문단 길이에 따른 처리 분기
-        if len(para) <= 2000:
-            # 짧은 문단: 직접 번역
-            replaced_text, mapping = apply_placeholders(para, entities)
-            print(f"[DEBUG] Original: {para[:100]}...")
-            print(f"[DEBUG] After placeholder: {replaced_text[:100]}...")
-            print(f"[DEBUG] Mapping: {mapping}")
+    if not text.strip():
+        return {target: "" for target in targets}
 
-            translated = _translate_block(
-                replaced_text,
-                source_lang_name,
-                target_lang_name,
-            )
-            print(f"[DEBUG] After translate: {translated[:100]}...")
-            
-            edited = _edit_block(translated, target_lang_name)
-            print(f"[DEBUG] After edit: {edited[:100]}...")
-            
-            edited = _advanced_editor(edited, target_language)
-            print(f"[DEBUG] After advanced_editor: {edited[:100]}...")
-
-            restored = restore_placeholders(edited, mapping, entities, target_language)
-            print(f"[DEBUG] After restore: {restored[:100]}...")
-            translated_paragraphs.append(restored)
+    paragraphs = text.split("\n\n")
+
+    results = {}
+    pending = []
+    for target in targets:
+        if target == source_language:
+            results[target] = text
         else:
-            # 긴 문단: 내부 청크 분할 → 번역 → 단일 문단으로 복원
-            # 🔒 주의: 이 분할은 문단 내부 기술 처리용이며,
-            #          출력에서는 반드시 하나의 문단으로 복원됨
-            chunks = _split_text(para)
-            chunk_results = []
-
-            for i, chunk in enumerate(chunks):
-                print(f"[DEBUG-CHUNK {i+1}] Original: {chunk[:100]}...")
-                replaced_text, mapping = apply_placeholders(chunk, entities)
-                print(f"[DEBUG-CHUNK {i+1}] After placeholder: {replaced_text[:100]}...")
-                print(f"[DEBUG-CHUNK {i+1}] Mapping: {mapping}")
-
-                translated = _translate_block(
-                    replaced_text,
-                    source_lang_name,
-                    target_lang_name,
-                )
-                print(f"[DEBUG-CHUNK {i+1}] After translate: {translated[:100]}...")
-                
-                edited = _edit_block(translated, target_lang_name)
-                print(f"[DEBUG-CHUNK {i+1}] After edit: {edited[:100]}...")
-                
-                edited = _advanced_editor(edited, target_language)
-                print(f"[DEBUG-CHUNK {i+1}] After advanced_editor: {edited[:100]}...")
-
-                restored = restore_placeholders(edited, mapping, entities, target_language)
-                print(f"[DEBUG-CHUNK {i+1}] After restore: {restored[:100]}...")
-                chunk_results.append(restored)
-
-            # 🔒 중요: \n으로만 연결 (문단 내부이므로 \n\n 아님)
-            merged_para = "\n".join(chunk_results)
-            translated_paragraphs.append(merged_para)
+            pending.append(target)
+
+    workers = max(1, min(len(pending) or 1, max_concurrency or MULTI_TARGET_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _translate_paragraphs,
+                paragraphs,
+                load_target_entities(title, target),
+                source_language,
+                target,
+            ): target
+            for target in pending
+        }
+        for future, target in futures.items():
+            try:
+                results[target] = future.result()
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                print(f"[DEBUG] translate_text_multi failed for {target}: {e}")
+                results[target] = e
+
+    # 요청한 언어 순서 유지
+    return {target: results[target] for target in targets}
+
+
+def iter_translate_text(
+    title: str,
+    text: str,
+    source_language: str = "ko",
+    target_language: str = "en",
+    max_in_flight: int = None,
+    on_delta=None,
+):
+    """
+    translate_text의 스트리밍 버전
+
+    원문 문단(\n\n 기준)이 번역될 때마다 순서대로 yield 한다.
+    yield: (paragraph_index, translated_text, stats)
+
+    - 입력 문단 수 = yield 횟수
+    - yield 되는 문단은 구조 처리/언어별 문단 리듬 적용 전 결과
+      (전체 문단을 모아 finalize_paragraphs()에 넘기면 translate_text()와 같은 결과,
+       단 RESTRUCTURE_WINDOW_CHARS > 0이면 translate_text()는 창 단위로 재구성하므로 다를 수 있음)
+    - on_delta(unit, text): 문단 확정 전 최종 단계 출력 미리보기
+      unit = 문단 인덱스 목록, text=None이면 해당 단위 미리보기 폐기 (재시도)
+      (작업 스레드에서 호출되므로 콜백 안에서 동기화 필요)
+    """
+    if not text.strip():
+        return
 
-    # 🔒 문단 복원: 원본과 동일한 문단 경계(\n\n)로 연결
-    final_text = "\n\n".join(translated_paragraphs)
-    
-    # 구조 처리 (기존 로직 유지)
-    structured_text = _process_structure(final_text)
-    
-    # 언어별 후처리 (GPT 설계 - 2단계 문단 리듬 시스템)
-    # 각 언어별 웹소설 플랫폼 표준에 맞춰 문단 리듬 조정
-    
-    print(f"[DEBUG] Starting paragraph restructuring for language: {target_language}")
-    
-    if target_language == "ko":
-        # 한국어: Naver Series, Kakao Page 스타일
-        print("[DEBUG] Calling restructure_paragraphs_ko...")
-        structured_text = restructure_paragraphs_ko(structured_text)
-        print("[DEBUG] restructure_paragraphs_ko completed")
-    
-    elif target_language == "en":
-        # 영어: Wattpad, WebNovel 스타일
-        print("[DEBUG] Calling restructure_paragraphs_en...")
-        structured_text = restructure_paragraphs_en(structured_text)
-        print("[DEBUG] restructure_paragraphs_en completed")
-    
-    elif target_language == "ja":
-        # 일본어: Narou, Kakuyomu 스타일
-        print("[DEBUG] Calling restructure_paragraphs_ja...")
-        structured_text = restructure_paragraphs_ja(structured_text)
-        print("[DEBUG] restructure_paragraphs_ja completed")
-    
-    elif target_language == "zh":
-        # 중국어: Qidian, Zongheng 스타일 (매우 짧은 문단)
-        print("[DEBUG] Calling restructure_paragraphs_zh...")
-        structured_text = restructure_paragraphs_zh(structured_text)
-        print("[DEBUG] restructure_paragraphs_zh completed")
-    
-    elif target_language == "es":
-        # 스페인어: Wattpad Spanish 스타일
-        print("[DEBUG] Calling restructure_paragraphs_es...")
-        structured_text = restructure_paragraphs_es(structured_text)
-        print("[DEBUG] restructure_paragraphs_es completed")
-    
-    elif target_language == "fr":
-        # 프랑스어: Wattpad French 스타일
-        print("[DEBUG] Calling restructure_paragraphs_fr...")
-        structured_text = restructure_paragraphs_fr(structured_text)
-        print("[DEBUG] restructure_paragraphs_fr completed")
-    
-    elif target_language == "de":
-        # 독일어: Wattpad German 스타일 (긴 문장 보상)
-        print("[DEBUG] Calling restructure_paragraphs_de...")
-        structured_text = restructure_paragraphs_de(structured_text)
-        print("[DEBUG] restructure_paragraphs_de completed")
-    
-    elif target_language == "pt":
-        # 포르투갈어: Wattpad Portuguese, Spirit Fanfics 스타일
-        print("[DEBUG] Calling restructure_paragraphs_pt...")
-        structured_text = restructure_paragraphs_pt(structured_text)
-        print("[DEBUG] restructure_paragraphs_pt completed")
-    
-    elif target_language == "id":
-        # 인도네시아어: Wattpad Indonesia, Cabaca 스타일
-        print("[DEBUG] Calling restructure_paragraphs_id...")
-        structured_text = restructure_paragraphs_id(structured_text)
-        print("[DEBUG] restructure_paragraphs_id completed")
-    
-    else:
-        print(f"[DEBUG] No paragraph editor for language: {target_language}")
-    
-    # 기타 언어: 기본 구조 처리만 적용
-    
-    print(f"[DEBUG] Paragraph restructuring finished. Returning result.")
-    return structured_text
+    entities = load_target_entities(title, target_language)
+
+    yield from _iter_paragraphs(
+        text.split("\n\n"),
+        entities,
+        source_language,
+        target_language,
+        max_in_flight,
+        on_delta,
+    )
+
+
+async def aiter_translate_text(
+    title: str,
+    text: str,
+    source_language: str = "ko",
+    target_language: str = "en",
+    max_in_flight: int = None,
+):
+    """
+    iter_translate_text의 async 버전
+    블로킹 LLM 호출은 기본 executor 스레드에서 실행
+    """
+    iterator = iter_translate_text(title, text, source_language, target_language, max_in_flight)
+    done = object()
+
+    while True:
+        item = await asyncio.to_thread(next, iterator, done)
+        if item is done:
+            break
+        yield item
+
+
+
+# ===============================
+# 🔁 증분 재번역 (문단 단위 diff)
+# ===============================
+ALIGNMENT_VERSION = 1
+
+
+def build_alignment(
+    source_paragraphs: list,
+    translated_paragraphs: list,
+    source_language: str,
+    target_language: str,
+) -> dict:
+    """
+    원문 문단 ↔ 번역 문단 정렬 정보 (증분 재번역용 sidecar)
+    번역 문단은 구조 처리/문단 리듬 적용 전 결과
+    """
+    return {
+        "version": ALIGNMENT_VERSION,
+        "source_language": source_language,
+        "target_language": target_language,
+        "paragraphs": [
+            {"source": src, "translation": tr}
+            for src, tr in zip(source_paragraphs, translated_paragraphs)
+        ],
+    }
+
+
+def _reusable_paragraphs(previous_alignment: dict, source_language: str, target_language: str):
+    """
+    이전 정렬 정보가 현재 요청과 호환되면 문단 목록, 아니면 None
+    """
+    if not isinstance(previous_alignment, dict):
+        return None
+    if (
+        previous_alignment.get("version") != ALIGNMENT_VERSION
+        or previous_alignment.get("source_language") != source_language
+        or previous_alignment.get("target_language") != target_language
+    ):
+        return None
+    paragraphs = previous_alignment.get("paragraphs")
+    if not isinstance(paragraphs, list):
+        return None
+    return paragraphs
+
+
+def translate_text_incremental(
+    title: str,
+    text: str,
+    previous_alignment: dict = None,
+    source_language: str = "ko",
+    target_language: str = "en",
+    max_in_flight: int = None,
+):
+    """
+    수정된 에피소드 증분 재번역
+
+    - 이전 원문 문단과 새 원문 문단을 diff (difflib, 문단 단위)
+    - 변경 없는 문단: 이전 번역 그대로 재사용
+    - 삽입/변경된 문단만 LLM 번역
+    - 최종 구조 처리/문단 리듬은 전체 텍스트에 다시 적용
+
+    previous_alignment가 없거나 언어/버전이 다르면 전체 번역.
+    ⚠️ 재사용 문단에는 이후 바뀐 고유명사 번역이 반영되지 않음.
+
+    반환: (final_text, alignment, stats)
+      stats: {"paragraphs", "reused", "translated", "skipped"}
+      (skipped = translated 중 LLM 없이 통과한 문단 수)
+    """
+    paragraphs = text.split("\n\n") if text.strip() else []
+    translated = [None] * len(paragraphs)
+
+    previous = _reusable_paragraphs(previous_alignment, source_language, target_language)
+    if previous:
+        old_sources = [p.get("source", "") for p in previous]
+        matcher = difflib.SequenceMatcher(None, old_sources, paragraphs, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                for offset in range(i2 - i1):
+                    translated[j1 + offset] = previous[i1 + offset].get("translation")
+
+    todo = [i for i, t in enumerate(translated) if t is None]
+    stats = {
+        "paragraphs": len(paragraphs),
+        "reused": len(paragraphs) - len(todo),
+        "translated": len(todo),
+        "skipped": 0,
+    }
+
+    if todo:
+        entities = load_target_entities(title, target_language)
+        todo_paragraphs = [paragraphs[i] for i in todo]
+        for sub_index, result, para_stats in _iter_paragraphs(
+            todo_paragraphs, entities, source_language, target_language, max_in_flight
+        ):
+            translated[todo[sub_index]] = result
+            stats["skipped"] += para_stats["skipped"]
+
+    print(f"[DEBUG] Incremental: {stats}")
 
+    alignment = build_alignment(paragraphs, translated, source_language, target_language)
+    final_text = finalize_paragraphs(translated, target_language) if paragraphs else ""
+    return final_text, alignment, stats
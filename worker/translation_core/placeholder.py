@@ -1,47 +1,317 @@
 # translation_core/placeholder.py
 
-import uuid
 import re
+import threading
+from collections import OrderedDict
 
+# ===============================
+# 🔒 placeholder 토큰 형식
+# ===============================
+# 문단 안 등장 순서 기반 짧은 토큰: __E1__, __E2__, ...
+# - 같은 문단 → 같은 토큰 (단계 캐시 키가 실행마다 바뀌지 않음)
+# - BPE 기준 4토큰 내외 (기존 __ENTITY_<uuid>__ 는 20토큰 이상)
+# - 프롬프트의 "__ENTITY_x__" 안내와 같은 __이름_번호__ 모양 유지
+# 원문에 이미 같은 모양의 문자열이 있으면 다음 접두사 사용 (충돌 방지)
+TOKEN_PREFIXES = ("E", "EN", "ENT", "ENTITY_")
+PLACEHOLDER_RE = re.compile(r"__(?:ENTITY_|ENT|EN|E)\d+__")
+_PREFIX_RES = {prefix: re.compile(rf"__{prefix}\d+__") for prefix in TOKEN_PREFIXES}
 
-def apply_placeholders(text: str, entities: dict):
+
+def token_prefix(text: str) -> str:
+    """
+    text에 없는 토큰 접두사 (모두 충돌하면 ValueError)
+    """
+    for prefix in TOKEN_PREFIXES:
+        if not _PREFIX_RES[prefix].search(text):
+            return prefix
+    raise ValueError("Text already contains every placeholder token form; cannot apply placeholders safely")
+
+
+# ===============================
+# 원문 언어별 이름 경계 규칙
+# ===============================
+# 기본 규칙 (?<!\w)이름(?!\w) 은 한글/한자/가나를 모두 \w로 보기 때문에
+# 조사가 붙은 "김독자는", 띄어쓰기가 없는 일본어/중국어 문장 속 이름을 놓친다.
+_HAN = r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]"
+_KATAKANA = r"[\u30a0-\u30ff\u31f0-\u31ff\uff66-\uff9f]"
+_HIRAGANA = r"[\u3041-\u309f]"
+_HANGUL = r"[\uac00-\ud7a3\u1100-\u11ff\u3131-\u318e]"
+# 위 문자를 제외한 단어 문자 (라틴 문자, 숫자 등)
+_OTHER_WORD = (
+    r"[^\W\u3041-\u30ff\u31f0-\u31ff\uff66-\uff9f"
+    r"\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7a3\u1100-\u11ff\u3131-\u318e]"
+)
+
+# 한국어: 이름(2자 이상) 뒤에 붙어도 이름으로 인정하는 조사/호칭/서술격 어미
+# 호칭 + 조사 + 보조사 조합을 미리 펼쳐 suffix trie로 컴파일 (1자 이름은 오탐이 많아 제외: "하" + "나")
+_KO_HONORIFICS = ("", "님", "씨", "군", "양", "들", "님들")
+_KO_PARTICLES = (
+    "", "은", "는", "이", "가", "을", "를", "의", "에", "에게", "에게서", "한테", "한테서",
+    "께", "께서", "에서", "으로", "로", "으로서", "로서", "으로써", "로써",
+    "와", "과", "랑", "이랑", "하고", "도", "만", "까지", "부터", "조차", "마저", "보다",
+    "처럼", "같이", "마다", "밖에", "뿐", "이나", "나", "이든", "든", "이라도", "라도",
+    "이란", "란", "이라는", "라는", "이라고", "라고", "이여", "여", "아", "야",
+    "이다", "다", "였다", "이었다", "이야", "이에요", "예요", "입니다", "이지만", "지만",
+    "이고", "고", "이며", "며", "인데", "이라서", "라서", "였던", "이었던", "인",
+)
+# 뒤에 보조사가 한 번 더 붙을 수 있는 조사 ("에게는", "과의", "까지도")
+_KO_STACKABLE = (
+    "에", "에게", "에게서", "한테", "한테서", "께", "께서", "에서", "으로", "로",
+    "와", "과", "랑", "이랑", "하고", "까지", "부터", "보다", "처럼", "마다", "만",
+)
+_KO_STACKED = ("는", "은", "도", "만", "의", "을", "를")
+KO_JOSA = sorted({
+    honorific + particle + stacked
+    for honorific in _KO_HONORIFICS
+    for particle in _KO_PARTICLES
+    for stacked in (("",) + _KO_STACKED if particle in _KO_STACKABLE else ("",))
+} - {""})
+
+# 일본어: 같은 문자 종류가 이어져도 이름으로 인정하는 호칭/접미사/조사
+JA_SUFFIXES = (
+    "様", "さま", "さん", "君", "くん", "ちゃん", "殿", "氏", "達", "たち", "先生", "先輩", "家",
+    "は", "が", "を", "の", "に", "へ", "と", "も", "で", "や", "から", "まで", "より", "ね", "よ",
+)
+
+
+def _no_join(classes) -> str:
+    """
+    현재 위치 앞뒤가 같은 종류 문자로 이어지지 않음 (단어 중간이 아님)
+    """
+    return "".join(f"(?!(?<={c}){c})" for c in classes)
+
+
+def _boundary_rules(source_language: str):
+    """
+    원문 언어 → ((여러 글자 이름 앞, 뒤), (1글자 이름 앞, 뒤)) 경계 정규식
+    - ko (기본): \w 경계, 2자 이상 이름 뒤에는 조사 허용
+    - ja: 한자/가타카나/히라가나/기타 문자 종류가 바뀌는 곳을 경계로 보고, 호칭/조사 허용
+    - zh: 띄어쓰기가 없으므로 2자 이상 한자 이름은 경계 검사 없이 (trie의 최장 일치),
+          1자 이름은 앞뒤가 한자가 아닐 때만
+    """
+    if source_language == "ja":
+        classes = (_HAN, _KATAKANA, _HIRAGANA, _HANGUL, _OTHER_WORD)
+        left = _no_join(classes)
+        right = f"(?:{_no_join(classes)}|(?={_trie_pattern(JA_SUFFIXES)}))"
+        return (left, right), (left, right)
+    if source_language == "zh":
+        classes = (_KATAKANA, _HIRAGANA, _HANGUL, _OTHER_WORD)
+        multi = _no_join(classes)
+        single = _no_join((_HAN,) + classes)
+        return (multi, multi), (single, single)
+
+    left, right = r"(?<!\w)", r"(?!\w)"
+    if source_language == "ko":
+        return (left, rf"(?:(?!\w)|(?={_KO_JOSA_PATTERN}(?!\w)))"), (left, right)
+    return (left, right), (left, right)
+
+
+# ===============================
+# 고유명사 matcher (스냅샷당 1회 컴파일)
+# ===============================
+# 고유명사 스냅샷별 컴파일된 matcher 보관 수 (title × 원문 언어 × 대상 언어)
+MATCHER_CACHE_SIZE = 32
+
+_matchers = OrderedDict()  # (id(entities), 원문 언어) -> (entities, len, EntityMatcher)
+_matchers_lock = threading.Lock()
+
+
+def _trie_pattern(names) -> str:
+    """
+    이름 목록 → 접두사를 공유하는 정규식 (문자 trie)
+    각 분기는 더 긴 이름을 먼저 시도 (greedy, 실패 시 backtrack) → leftmost-longest
+    """
+    trie = {}
+    for name in names:
+        node = trie
+        for ch in name:
+            node = node.setdefault(ch, {})
+        node[""] = None  # 이름 끝
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # 여기서 끝나는 이름도 있음: 더 긴 쪽 먼저 (greedy)
+            body = f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+_KO_JOSA_PATTERN = _trie_pattern(KO_JOSA)
+
+
+def matcher_tables(names) -> tuple:
+    """
+    이름 목록 → (여러 글자 이름 trie, 1글자 이름 trie) 정규식 본문
+    원문 언어와 무관 (경계 규칙은 컴파일할 때 덧붙임) → entity_pack에 그대로 저장
+    """
+    names = [name for name in names if name]
+    return (
+        _trie_pattern([name for name in names if len(name) > 1]),
+        _trie_pattern([name for name in names if len(name) == 1]),
+    )
+
+
+class EntityMatcher:
+    """
+    고유명사 전체를 한 번에 치환하는 컴파일된 matcher
+    - 모든 이름을 trie 정규식 1개로 합쳐 텍스트를 한 번만 스캔
+    - 이름 경계는 원문 언어 규칙 (_boundary_rules): 조사/호칭은 치환하지 않고 남김 ("김독자는" → "__E1__는")
+    - 겹치는 이름은 가장 왼쪽에서 시작하는 가장 긴 이름 우선
+    """
+
+    def __init__(self, names, source_language: str = "ko", tables: tuple = None):
+        """
+        tables: 미리 만들어 둔 matcher_tables(names) 결과 (entity_pack) - 있으면 trie 생성 생략
+        """
+        self.source_language = source_language
+        if tables is None:
+            names = [name for name in names if name]
+            tables = matcher_tables(names)
+        self.size = len(names)
+
+        multi, single = tables
+        (multi_left, multi_right), (single_left, single_right) = _boundary_rules(source_language)
+        # 여러 글자 이름 먼저 시도 → 실패하면 1글자 이름
+        alternatives = []
+        if multi:
+            alternatives.append(f"{multi_left}(?:{multi}){multi_right}")
+        if single:
+            alternatives.append(f"{single_left}(?:{single}){single_right}")
+        self.pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+    def apply(self, text: str, start: int = 1, context: str = None):
+        """
+        start: 첫 토큰 번호 (여러 문단을 한 요청에 묶을 때 번호가 겹치지 않도록)
+        context: 충돌 검사 대상 (기본 text, 묶음이면 묶음 전체)
+        """
+        if self.pattern is None:
+            return text, {}
+
+        tokens = {}  # name -> token
+        prefix = None
+
+        def replace(match):
+            nonlocal prefix
+            name = match.group(0)
+            token = tokens.get(name)
+            if token is None:
+                if prefix is None:
+                    prefix = token_prefix(text if context is None else context)
+                # 🔒 ASCII 기반, GPT 안전 placeholder
+                token = f"__{prefix}{start + len(tokens)}__"
+                tokens[name] = token
+            return token
+
+        text = self.pattern.sub(replace, text)
+        return text, {token: name for name, token in tokens.items()}
+
+
+def get_matcher(entities: dict, source_language: str = "ko") -> EntityMatcher:
+    """
+    고유명사 스냅샷(dict) → EntityMatcher (같은 스냅샷 + 원문 언어면 재사용)
+    스냅샷 객체가 같아도 항목 수가 바뀌었으면 다시 컴파일
+    """
+    key = (id(entities), source_language)
+    with _matchers_lock:
+        cached = _matchers.get(key)
+        if cached and cached[0] is entities and cached[1] == len(entities):
+            _matchers.move_to_end(key)
+            return cached[2]
+
+    # entity_pack 스냅샷이면 저장된 trie 사용 (이름 목록을 다시 읽지 않음)
+    tables = entities.matcher_tables() if hasattr(entities, "matcher_tables") else None
+    matcher = EntityMatcher(entities, source_language, tables)
+
+    with _matchers_lock:
+        # 스냅샷 dict 참조를 함께 보관 → 살아 있는 동안 id 재사용 없음
+        _matchers[key] = (entities, len(entities), matcher)
+        _matchers.move_to_end(key)
+        while len(_matchers) > MATCHER_CACHE_SIZE:
+            _matchers.popitem(last=False)
+    return matcher
+
+
+def apply_placeholders(text: str, entities: dict, start: int = 1, context: str = None, source_language: str = "ko"):
+    """
+    Replace entity names with short indexed placeholders (__E1__, __E2__, ...).
+    Overlapping names resolve leftmost-longest in a single scan.
+    Word-boundary safe replacement is enforced per source language
+    (Korean particles stay after the token, ja/zh use script-change boundaries).
+    """
+    return get_matcher(entities, source_language).apply(text, start, context)
+
+
+# ===============================
+# 복원 (1회 스캔 + 변형된 토큰 복구)
+# ===============================
+# LLM이 흔히 망가뜨리는 형태도 같은 토큰으로 인식:
+#   대소문자 (__e3__), 밑줄 누락/추가 (_E3_, __E3, ___E3___), 공백 (__ E3 __, __E 3__)
+_TOLERANT_TOKEN_RE = re.compile(
+    r"(?<![A-Za-z0-9])_{1,3}[ \t]*(ENTITY|ENT|EN|E)[ \t]*_?[ \t]*(\d+)[ \t]*_{0,3}",
+    re.IGNORECASE,
+)
+
+
+def _token_key(prefix: str, number: str):
+    return prefix.upper().rstrip("_"), int(number)
+
+
+def find_placeholders(text: str) -> set:
     """
-    Replace entity names with unique placeholders.
-    Longer names are replaced first to avoid partial collisions.
-    Word-boundary safe replacement is enforced.
+    text에 있는 placeholder (변형된 모양 포함) → 정규 토큰 집합 ({"__E1__", ...})
     """
+    tokens = set()
+    for match in _TOLERANT_TOKEN_RE.finditer(text):
+        prefix, number = _token_key(match.group(1), match.group(2))
+        tokens.add(f"__{'ENTITY_' if prefix == 'ENTITY' else prefix}{number}__")
+    return tokens
 
-    mapping = {}
 
-    # 🔑 길이 긴 고유명사부터 처리 (부분 충돌 방지)
-    sorted_names = sorted(entities.keys(), key=len, reverse=True)
+def restore_placeholders_checked(text: str, mapping: dict, entities: dict, target_language: str = "en"):
+    """
+    placeholder 복원 (정규식 1회 스캔) + 복원하지 못한 토큰 보고
+    반환: (복원된 텍스트, unrecovered)
+      unrecovered: 이 매핑과 같은 접두사인데 매핑에 없는 토큰 (모델이 번호를 바꾸거나 지어냄)
+                   → 비어 있지 않으면 호출부에서 해당 문단만 다시 요청
+    원문에 원래 있던 다른 접두사의 토큰 모양 문자열은 그대로 둠
+    """
+    if not mapping:
+        return text, []
 
-    for name in sorted_names:
-        # 🔒 ASCII 기반, GPT 안전 placeholder
-        token = f"__ENTITY_{uuid.uuid4().hex}__"
+    by_key = {}
+    prefixes = set()
+    for token, source_name in mapping.items():
+        m = _TOLERANT_TOKEN_RE.fullmatch(token)
+        key = _token_key(m.group(1), m.group(2))
+        # entities[source_name]이 이미 번역된 값(string), 없으면 원문(source_name) 유지
+        by_key[key] = entities.get(source_name, source_name)
+        prefixes.add(key[0])
 
-        # 🔒 단어 경계 기반 치환 (부분 오염 방지)
-        pattern = re.compile(rf'(?<!\w){re.escape(name)}(?!\w)')
+    unrecovered = []
 
-        if pattern.search(text):
-            text = pattern.sub(token, text)
-            mapping[token] = name
+    def replace(match):
+        key = _token_key(match.group(1), match.group(2))
+        replacement = by_key.get(key)
+        if replacement is not None:
+            return replacement
+        if key[0] in prefixes:
+            unrecovered.append(match.group(0))
+        return match.group(0)
 
-    return text, mapping
+    return _TOLERANT_TOKEN_RE.sub(replace, text), unrecovered
 
 
 def restore_placeholders(text: str, mapping: dict, entities: dict, target_language: str = "en"):
     """
     Restore placeholders using stored entity translations.
-    
+    Mangled tokens (case, underscores, spaces) are recovered in the same single pass.
+
     Note: entities는 이미 pipeline.py에서 필터링되어
     {source_name: translated_value} 형태의 string 값을 담고 있음.
     """
-
-    for token, source_name in mapping.items():
-        # entities[source_name]이 이미 번역된 값(string)
-        # 없으면 원문(source_name) 유지
-        replacement = entities.get(source_name, source_name)
-        text = text.replace(token, replacement)
-
-    return text
+    return restore_placeholders_checked(text, mapping, entities, target_language)[0]
@@ -0,0 +1,173 @@
+# translation_core/rate_limiter.py
+
+import os
+import time
+import random
+import sqlite3
+import tempfile
+import threading
+
+# ===============================
+# LLM 호출 속도 제한 (RPM / TPM 토큰 버킷, 프로세스 간 공유)
+# ===============================
+# Azure/OpenAI 배포 할당량에 맞춰 설정 (0이면 해당 버킷 비활성)
+RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "0"))
+TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "0"))
+
+# 할당량 대비 사용 비율 (경계에서 429가 나지 않도록 약간 아래로)
+HEADROOM = float(os.getenv("LLM_RATE_HEADROOM", "0.9"))
+
+STATE_PATH = os.getenv(
+    "LLM_RATE_LIMIT_PATH",
+    os.path.join(tempfile.gettempdir(), "narra_llm_rate_limit.sqlite3"),
+)
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(STATE_PATH, timeout=10.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=10000")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS buckets (
+                name TEXT PRIMARY KEY,
+                level REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cooldown (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                until REAL NOT NULL
+            )
+            """
+        )
+        _local.conn = conn
+    return conn
+
+
+def _take(requests: list) -> float:
+    """
+    여러 버킷에서 한 번에 차감 시도 (requests: [(name, amount, per_minute), ...])
+    모든 버킷이 충분할 때만 전부 차감 → TPM을 기다리는 동안 RPM이 반복 차감되지 않음
+    반환: 0이면 성공, 양수면 그만큼(초) 기다린 뒤 재시도 (이때는 아무것도 차감하지 않음)
+    """
+    conn = _connect()
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        levels = []
+        wait = 0.0
+        for name, amount, per_minute in requests:
+            capacity = per_minute * HEADROOM
+            rate = capacity / 60.0
+            amount = min(amount, capacity)  # 한 번에 용량보다 큰 요청은 가득 찬 버킷 1개로 취급
+
+            row = conn.execute("SELECT level, updated_at FROM buckets WHERE name = ?", (name,)).fetchone()
+            level = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+            if level < amount:
+                wait = max(wait, (amount - level) / rate)
+            levels.append((name, level - amount))
+
+        if wait <= 0:
+            for name, level in levels:
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, level, updated_at) VALUES (?, ?, ?)",
+                    (name, level, now),
+                )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return wait
+
+
+def _cooldown_remaining() -> float:
+    row = _connect().execute("SELECT until FROM cooldown WHERE id = 1").fetchone()
+    return max(0.0, row[0] - time.time()) if row else 0.0
+
+
+def acquire(tokens: int = 0):
+    """
+    요청 1건 + 예상 토큰 tokens개를 쓸 수 있을 때까지 대기
+    (다른 프로세스가 받은 Retry-After 쿨다운도 함께 반영)
+    """
+    try:
+        while True:
+            wait = _cooldown_remaining()
+            if wait <= 0:
+                buckets = []
+                if RPM_LIMIT > 0:
+                    buckets.append(("requests", 1, RPM_LIMIT))
+                if TPM_LIMIT > 0 and tokens > 0:
+                    buckets.append(("tokens", tokens, TPM_LIMIT))
+                if buckets:
+                    wait = _take(buckets)
+            if wait <= 0:
+                return
+            # 여러 프로세스가 동시에 깨어나지 않도록 지터
+            time.sleep(wait + random.uniform(0, min(1.0, wait * 0.1)))
+    except sqlite3.Error as e:
+        # 제한기 장애가 번역을 막으면 안 됨
+        print(f"[rate_limiter] State error, proceeding without limit: {e}")
+
+
+def set_cooldown(seconds: float):
+    """
+    429 Retry-After 수신 시 모든 프로세스가 seconds 동안 새 요청을 보내지 않도록 기록
+    """
+    if seconds <= 0:
+        return
+    until = time.time() + seconds
+    try:
+        _connect().execute(
+            "INSERT INTO cooldown (id, until) VALUES (1, ?) "
+            "ON CONFLICT(id) DO UPDATE SET until = MAX(until, excluded.until)",
+            (until,),
+        )
+    except sqlite3.Error as e:
+        print(f"[rate_limiter] Failed to record cooldown: {e}")
+
+
+def parse_retry_after(headers) -> float:
+    """
+    retry-after-ms / retry-after(초 또는 HTTP-date) 헤더 → 초 (없으면 0)
+    """
+    if not headers:
+        return 0.0
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            from email.utils import parsedate_to_datetime
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return 0.0
+
+
+def backoff_delay(attempt: int, retry_after: float = 0.0, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    재시도 대기 시간
+    - Retry-After가 있으면 그 값 + 작은 지터
+    - 없으면 지수 백오프 full jitter
+    """
+    if retry_after > 0:
+        return retry_after + random.uniform(0, min(2.0, retry_after * 0.25))
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,93 @@
+# translation_core/stream_guard.py
+
+import os
+
+from translation_core.placeholder import find_placeholders
+from translation_core.token_budget import estimate_tokens
+
+# ===============================
+# 스트리밍 출력 폭주 감지
+# ===============================
+# 모델이 같은 문장을 반복하거나, 원문보다 훨씬 길게 덧붙이거나,
+# placeholder를 지어내기 시작하면 끝까지 기다리지 않고 즉시 중단한다.
+# (중단된 요청은 create_completion에서 같은 요청으로 재시도, 파이프라인 단계는 _complete의 검증 재요청으로)
+
+# 출력 토큰 상한 = max(입력 토큰 × 비율, 최소 여유)
+STREAM_MAX_RATIO = float(os.getenv("STREAM_MAX_RATIO", "3.0"))
+STREAM_MIN_TOKENS = int(os.getenv("STREAM_MIN_TOKENS", "200"))
+
+# 같은 구간이 꼬리에서 연속 N회 반복되면 루프로 판단
+STREAM_LOOP_REPEATS = int(os.getenv("STREAM_LOOP_REPEATS", "4"))
+LOOP_MIN_PERIOD = 12  # 반복 단위 최소 길이 (문자)
+LOOP_MAX_PERIOD = 400  # 반복 단위 최대 길이 (문자)
+
+# 검사 간격 (문자): 매 조각마다 전체를 다시 보지 않도록
+CHECK_EVERY_CHARS = 200
+
+class RunawayOutputError(RuntimeError):
+    """
+    스트리밍 중 폭주 감지로 요청을 중단함 (reason: 사유, partial: 중단 시점까지 받은 출력)
+    """
+
+    def __init__(self, reason: str, partial: str = ""):
+        super().__init__(f"Runaway output aborted: {reason}")
+        self.reason = reason
+        self.partial = partial
+
+
+def _repeated_tail(text: str, repeats: int) -> bool:
+    """
+    text 끝부분이 같은 구간의 repeats회 연속 반복인지
+    (글자가 거의 없는 구간 - 말줄임표, 구분선 등은 제외)
+    """
+    tail = text[-LOOP_MAX_PERIOD * repeats:]
+    for period in range(LOOP_MIN_PERIOD, len(tail) // repeats + 1):
+        unit = tail[-period:]
+        if sum(ch.isalnum() for ch in unit) < LOOP_MIN_PERIOD // 2:
+            continue
+        if all(tail[-period * (k + 1):len(tail) - period * k] == unit for k in range(1, repeats)):
+            return True
+    return False
+
+
+class StreamGuard:
+    """
+    요청 본문(source_text) 기준으로 스트리밍 출력 누적분을 검사
+    - feed(delta): 조각 추가, 이상 시 RunawayOutputError
+    - finish(): 스트림 종료 후 마지막 조각까지 같은 검사
+    """
+
+    def __init__(self, source_text: str):
+        self.source_text = source_text or ""
+        self.max_tokens = max(
+            int(estimate_tokens(self.source_text) * STREAM_MAX_RATIO),
+            STREAM_MIN_TOKENS,
+        )
+        self.placeholders = find_placeholders(self.source_text)
+        # 원문 자체에 반복이 있으면 (의성어, 반복 대사 등) 루프 검사 생략
+        self.check_loops = STREAM_LOOP_REPEATS > 1 and not _repeated_tail(self.source_text, STREAM_LOOP_REPEATS)
+        self.text = ""
+        self._checked = 0
+
+    def feed(self, delta: str):
+        self.text += delta
+        if len(self.text) - self._checked < CHECK_EVERY_CHARS:
+            return
+        self._checked = len(self.text)
+        self._check()
+
+    def _check(self):
+        if estimate_tokens(self.text) > self.max_tokens:
+            raise RunawayOutputError(f"output exceeds {self.max_tokens} tokens")
+
+        unknown = find_placeholders(self.text) - self.placeholders
+        if unknown:
+            raise RunawayOutputError(f"unknown placeholder {sorted(unknown)[0]}")
+
+        if self.check_loops and _repeated_tail(self.text, STREAM_LOOP_REPEATS):
+            raise RunawayOutputError("repeated output loop")
+
+    def finish(self):
+        # 누락된 placeholder는 중단 사유가 아님 (전체 출력이 이미 도착함)
+        # → 문단별 검증 / 복원 단계의 재요청이 처리
+        self._check()
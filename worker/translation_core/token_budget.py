@@ -0,0 +1,276 @@
+# translation_core/token_budget.py
+
+import os
+import re
+import sys
+import json
+import threading
+
+# ===============================
+# 토큰 예산 기반 청크 계획 (오프라인 추정, 네트워크 없음)
+# ===============================
+# 문자 수 기준 분할은 스크립트별 토큰 밀도 차이를 무시한다.
+# (한글/한자 1자 ≈ 1토큰, 영문 1자 ≈ 0.2토큰)
+# 여기서는 스크립트별 "문자당 토큰" 계수로 토큰 수를 추정하고,
+# 입력 + 예상 출력 토큰이 예산 안에 들어오도록 청크를 나눈다.
+
+# 스크립트별 문자당 토큰 수 (gpt-4o 계열 응답 usage 기준 보정값)
+# TOKEN_RATES_PATH(JSON)로 덮어쓸 수 있음 → calibrate 명령으로 생성
+SCRIPT_TOKEN_RATES = {
+    "hangul": 0.78,
+    "cjk": 0.82,
+    "kana": 0.70,
+    "latin": 0.22,
+    "digit": 0.34,
+    "space": 0.05,
+    "other": 0.60,
+}
+
+# 같은 내용을 표현하는 데 드는 상대 토큰 양 (한국어 = 1.0)
+# 출력 토큰 추정: 입력 토큰 × density[target] / density[source]
+LANGUAGE_TOKEN_DENSITY = {
+    "ko": 1.00,
+    "ja": 1.05,
+    "zh": 0.85,
+    "en": 0.60,
+    "es": 0.75,
+    "fr": 0.80,
+    "de": 0.85,
+    "pt": 0.75,
+    "id": 0.75,
+}
+
+# 요청 1회당 (입력 + 출력) 목표 토큰 수
+TOKEN_BUDGET = int(os.getenv("TRANSLATION_TOKEN_BUDGET", "2400"))
+
+# 사용량 기록 (보정용, 비어 있으면 기록 안 함)
+TOKEN_USAGE_LOG = os.getenv("TOKEN_USAGE_LOG", "")
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?。！？…])\s+")
+_usage_lock = threading.Lock()
+
+
+def _load_rates():
+    path = os.getenv("TOKEN_RATES_PATH")
+    if not path or not os.path.exists(path):
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rates = json.load(f)
+        SCRIPT_TOKEN_RATES.update({k: float(v) for k, v in rates.items() if k in SCRIPT_TOKEN_RATES})
+    except (OSError, ValueError) as e:
+        print(f"[token_budget] Failed to load {path}: {e}")
+
+
+_load_rates()
+
+
+# ===============================
+# 토큰 추정
+# ===============================
+def _script_of(ch: str) -> str:
+    code = ord(ch)
+    if 0xAC00 <= code <= 0xD7A3 or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return "hangul"
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF or 0xF900 <= code <= 0xFAFF:
+        return "cjk"
+    if 0x3040 <= code <= 0x30FF:
+        return "kana"
+    if ch.isspace():
+        return "space"
+    if ch.isdigit():
+        return "digit"
+    if ch.isalpha():
+        return "latin"
+    return "other"
+
+
+def script_counts(text: str) -> dict:
+    counts = dict.fromkeys(SCRIPT_TOKEN_RATES, 0)
+    for ch in text:
+        counts[_script_of(ch)] += 1
+    return counts
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트 토큰 수 추정 (스크립트별 계수 합)
+    """
+    if not text:
+        return 0
+    counts = script_counts(text)
+    return int(sum(SCRIPT_TOKEN_RATES[s] * n for s, n in counts.items())) + 1
+
+
+def estimate_output_tokens(input_tokens: int, source_language: str, target_language: str) -> int:
+    src = LANGUAGE_TOKEN_DENSITY.get(source_language, 1.0)
+    tgt = LANGUAGE_TOKEN_DENSITY.get(target_language, 1.0)
+    return int(input_tokens * tgt / src) + 1
+
+
+def input_budget(source_language: str, target_language: str = None, total_budget: int = None) -> int:
+    """
+    (입력 + 예상 출력) ≤ total_budget 을 만족하는 최대 입력 토큰 수
+    target_language가 없으면 (출력이 작은 작업) 전체 예산을 입력에 사용
+    """
+    total_budget = total_budget or TOKEN_BUDGET
+    if not target_language:
+        return total_budget
+    src = LANGUAGE_TOKEN_DENSITY.get(source_language, 1.0)
+    tgt = LANGUAGE_TOKEN_DENSITY.get(target_language, 1.0)
+    return max(1, int(total_budget / (1 + tgt / src)))
+
+
+# ===============================
+# 청크 계획
+# ===============================
+def _split_oversized(unit: str, max_tokens: int) -> list:
+    """
+    예산을 넘는 단위 → 문장 경계, 그래도 넘으면 문자 수로 분할
+    """
+    pieces = []
+    for sentence in _SENTENCE_END_RE.split(unit):
+        if estimate_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        # 문장 하나가 예산 초과: 추정 밀도 기준 문자 수로 자름
+        density = max(estimate_tokens(sentence) / max(len(sentence), 1), 0.01)
+        step = max(1, int(max_tokens / density))
+        pieces.extend(sentence[i:i + step] for i in range(0, len(sentence), step))
+    return pieces
+
+
+def pack_units(
+    units: list,
+    max_tokens: int,
+    split_oversized: bool = False,
+    max_units: int = None,
+    text_of=None,
+) -> list:
+    """
+    순서 유지하며 단위(문단/줄)들을 max_tokens 이하 묶음으로 그룹화
+    반환: [[unit, ...], ...]
+
+    - 단위 하나가 예산을 넘으면 단독 묶음 (split_oversized=True면 문장 단위로 분할)
+    - max_units: 묶음 1개의 최대 단위 수
+    - text_of: 단위 → 토큰을 셀 텍스트 (단위가 문단 인덱스 등일 때, 기본은 단위 자체)
+    """
+    groups = []
+    group = []
+    group_tokens = 0
+
+    for unit in units:
+        tokens = estimate_tokens(unit if text_of is None else text_of(unit))
+
+        if tokens > max_tokens:
+            if group:
+                groups.append(group)
+                group, group_tokens = [], 0
+            if split_oversized:
+                groups.extend([[piece] for piece in _split_oversized(unit, max_tokens) if piece])
+            else:
+                groups.append([unit])
+            continue
+
+        if group and (group_tokens + tokens > max_tokens or (max_units and len(group) >= max_units)):
+            groups.append(group)
+            group, group_tokens = [], 0
+
+        group.append(unit)
+        group_tokens += tokens
+
+    if group:
+        groups.append(group)
+    return groups
+
+
+def plan_chunks(
+    text: str,
+    source_language: str = "ko",
+    target_language: str = None,
+    total_budget: int = None,
+    separator: str = "\n\n",
+    split_oversized: bool = False,
+) -> list:
+    """
+    텍스트 → 토큰 예산 기준 청크 목록 (separator 경계에서만 분할)
+    separator.join(청크 목록) == text (split_oversized=False일 때)
+    """
+    max_tokens = input_budget(source_language, target_language, total_budget)
+    groups = pack_units(text.split(separator), max_tokens, split_oversized)
+    return [separator.join(group) for group in groups]
+
+
+# ===============================
+# 보정 (기록된 usage → 계수)
+# ===============================
+def record_usage(text: str, tokens: int):
+    """
+    (텍스트, 실제 토큰 수) 1건을 TOKEN_USAGE_LOG(JSONL)에 기록
+    """
+    if not TOKEN_USAGE_LOG or not text or not tokens:
+        return
+    line = json.dumps({"counts": script_counts(text), "tokens": int(tokens)}, ensure_ascii=False)
+    try:
+        with _usage_lock, open(TOKEN_USAGE_LOG, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"[token_budget] Failed to record usage: {e}")
+
+
+def fit_rates(samples: list) -> dict:
+    """
+    samples: [{"counts": {script: n}, "tokens": n}, ...]
+    최소제곱 (정규방정식) → 스크립트별 계수, 음수는 0으로 보정
+    샘플이 없는 스크립트는 기존 계수 유지
+    """
+    scripts = [s for s in SCRIPT_TOKEN_RATES if any(x["counts"].get(s) for x in samples)]
+    if not scripts:
+        return dict(SCRIPT_TOKEN_RATES)
+
+    n = len(scripts)
+    # A^T A x = A^T b (릿지 항으로 특이 행렬 방지)
+    ata = [[1e-6 if i == j else 0.0 for j in range(n)] for i in range(n)]
+    atb = [0.0] * n
+    for sample in samples:
+        row = [sample["counts"].get(s, 0) for s in scripts]
+        for i in range(n):
+            atb[i] += row[i] * sample["tokens"]
+            for j in range(n):
+                ata[i][j] += row[i] * row[j]
+
+    # 가우스 소거
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(ata[r][col]))
+        ata[col], ata[pivot] = ata[pivot], ata[col]
+        atb[col], atb[pivot] = atb[pivot], atb[col]
+        for r in range(n):
+            if r != col and ata[col][col]:
+                factor = ata[r][col] / ata[col][col]
+                for c in range(col, n):
+                    ata[r][c] -= factor * ata[col][c]
+                atb[r] -= factor * atb[col]
+
+    rates = dict(SCRIPT_TOKEN_RATES)
+    for i, s in enumerate(scripts):
+        if ata[i][i]:
+            rates[s] = round(max(0.0, atb[i] / ata[i][i]), 4)
+    return rates
+
+
+def main():
+    """
+    python -m translation_core.token_budget calibrate usage.jsonl > rates.json
+    """
+    if len(sys.argv) != 3 or sys.argv[1] != "calibrate":
+        print("Usage: python -m translation_core.token_budget calibrate <usage.jsonl>", file=sys.stderr)
+        sys.exit(1)
+
+    with open(sys.argv[2], "r", encoding="utf-8") as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+
+    print(json.dumps(fit_rates(samples), indent=2))
+
+
+if __name__ == "__main__":
+    main()
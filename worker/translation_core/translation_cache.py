@@ -0,0 +1,172 @@
+# translation_core/translation_cache.py
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+
+# ===============================
+# 번역 단계 결과 캐시 (SQLite WAL, 프로세스 간 공유)
+# ===============================
+CACHE_ENABLED = os.getenv("TRANSLATION_CACHE", "true").lower() == "true"
+CACHE_PATH = os.getenv(
+    "TRANSLATION_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "narra_translation_cache.sqlite3"),
+)
+CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "200000"))
+
+# 키 형식/프롬프트 구성이 바뀌면 올려서 전체 무효화
+CACHE_VERSION = 1
+
+# 쓰기 N회마다 한 번 용량 검사
+_EVICT_EVERY = 200
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {}  # stage -> {"hits": n, "misses": n}
+_writes = 0
+
+
+def set_enabled(enabled: bool):
+    """
+    캐시 사용 여부 (False = bypass: 조회/저장 모두 생략)
+    """
+    global CACHE_ENABLED
+    CACHE_ENABLED = enabled
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    스레드별 커넥션 (sqlite3 커넥션은 스레드 간 공유 불가)
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS stage_cache (
+                key TEXT PRIMARY KEY,
+                stage TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_stage_cache_last_used ON stage_cache(last_used_at)")
+        _local.conn = conn
+    return conn
+
+
+def make_key(stage: str, model: str, temperature: float, messages: list) -> str:
+    """
+    (단계, 모델/배포명, temperature, 전체 메시지) → sha256
+
+    messages에는 언어 지시문, 단계 프롬프트 전문, placeholder 치환된 본문이
+    모두 들어 있으므로 프롬프트가 바뀌면 키도 자동으로 바뀐다.
+    """
+    payload = json.dumps(
+        {
+            "v": CACHE_VERSION,
+            "stage": stage,
+            "model": model,
+            "temperature": temperature,
+            "messages": messages,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _count(stage: str, field: str):
+    with _stats_lock:
+        _stats.setdefault(stage, {"hits": 0, "misses": 0})[field] += 1
+
+
+def get(key: str, stage: str):
+    if not CACHE_ENABLED:
+        return None
+    try:
+        conn = _connect()
+        row = conn.execute("SELECT value FROM stage_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            _count(stage, "misses")
+            return None
+        conn.execute("UPDATE stage_cache SET last_used_at = ? WHERE key = ?", (time.time(), key))
+        _count(stage, "hits")
+        return row[0]
+    except sqlite3.Error as e:
+        # 캐시 장애가 번역을 막으면 안 됨
+        print(f"[translation_cache] Read error: {e}")
+        return None
+
+
+def put(key: str, stage: str, value: str):
+    global _writes
+    if not CACHE_ENABLED:
+        return
+    try:
+        now = time.time()
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO stage_cache (key, stage, value, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+            (key, stage, value, now, now),
+        )
+        with _stats_lock:
+            _writes += 1
+            should_evict = _writes % _EVICT_EVERY == 0
+        if should_evict:
+            evict()
+    except sqlite3.Error as e:
+        print(f"[translation_cache] Write error: {e}")
+
+
+def evict(max_entries: int = None):
+    """
+    LRU 정리: last_used_at 오래된 순으로 max_entries 초과분 삭제
+    """
+    max_entries = CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    conn = _connect()
+    conn.execute(
+        """
+        DELETE FROM stage_cache WHERE key IN (
+            SELECT key FROM stage_cache
+            ORDER BY last_used_at DESC
+            LIMIT -1 OFFSET ?
+        )
+        """,
+        (max_entries,),
+    )
+
+
+def cached_call(stage: str, model: str, temperature: float, messages: list, compute) -> str:
+    """
+    캐시 조회 → 없으면 compute() 실행 후 저장
+    """
+    if not CACHE_ENABLED:
+        return compute()
+
+    key = make_key(stage, model, temperature, messages)
+    cached = get(key, stage)
+    if cached is not None:
+        return cached
+
+    value = compute()
+    put(key, stage, value)
+    return value
+
+
+def cache_stats() -> dict:
+    """
+    프로세스 내 단계별 hit/miss 카운터
+    """
+    with _stats_lock:
+        return {stage: dict(counts) for stage, counts in _stats.items()}
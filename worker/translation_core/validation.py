@@ -0,0 +1,119 @@
+# translation_core/validation.py
+
+import os
+
+from translation_core.placeholder import PLACEHOLDER_RE, find_placeholders
+from translation_core.token_budget import LANGUAGE_TOKEN_DENSITY, estimate_tokens, script_counts
+
+# ===============================
+# 단계 출력 검증 (문단 단위)
+# ===============================
+# LLM 단계 출력 1건을 입력과 비교해 문제 목록을 돌려준다 (빈 목록 = 통과).
+# - placeholder: apply_placeholders 매핑의 토큰이 모두 남아 있는지, 없는 토큰을 지어냈는지
+# - 스크립트: 출력 글자가 대상 언어 문자 체계인지 (미번역/다른 언어 출력)
+# - 길이 비율: 언어쌍 예상 비율 대비 너무 짧거나(잘림) 너무 긴지(덧붙임)
+
+# 단계 1회당 검증 실패 재요청 횟수
+VALIDATION_RETRIES = int(os.getenv("VALIDATION_RETRIES", "2"))
+
+# 대상 언어 문자 비율 하한 (글자 SCRIPT_MIN_LETTERS개 미만인 짧은 출력은 검사 생략)
+SCRIPT_MIN_SHARE = float(os.getenv("VALIDATION_SCRIPT_MIN_SHARE", "0.5"))
+SCRIPT_MIN_LETTERS = 8
+
+# (출력 토큰 / 입력 토큰) ÷ 언어쌍 예상 비율 허용 범위
+LENGTH_RATIO_MIN = float(os.getenv("VALIDATION_LENGTH_RATIO_MIN", "0.35"))
+LENGTH_RATIO_MAX = float(os.getenv("VALIDATION_LENGTH_RATIO_MAX", "3.0"))
+LENGTH_MIN_SOURCE_TOKENS = 12  # 이보다 짧은 입력은 하한 검사 생략 ("응." → "Yeah.")
+
+TARGET_SCRIPTS = {
+    "ko": {"hangul"},
+    "ja": {"kana", "cjk"},
+    "zh": {"cjk"},
+}
+DEFAULT_TARGET_SCRIPTS = {"latin"}
+LETTER_SCRIPTS = ("hangul", "cjk", "kana", "latin")
+
+class OutputValidationError(RuntimeError):
+    """
+    재요청 후에도 단계 출력이 검증을 통과하지 못함
+    issues: 문제 목록, output: 마지막 출력 (호출부 선택에 따라 그대로 사용 가능, 스트림 중단/타임아웃이면 None)
+    """
+
+    def __init__(self, stage: str, issues: list, output: str):
+        super().__init__(f"{stage} output failed validation: {'; '.join(issues)}")
+        self.stage = stage
+        self.issues = issues
+        self.output = output
+
+
+def check_placeholders(output: str, placeholders, literal=()) -> list:
+    """
+    literal: 입력 원문에 원래 있던 토큰 모양 문자열 (placeholder 아님, 지어낸 것으로 보지 않음)
+    복원 단계에서 되살릴 수 있는 변형 (__e1__, _E1_ 등)은 있는 것으로 봄
+    """
+    expected = set(placeholders)
+    found = find_placeholders(output)
+    issues = []
+    missing = expected - found
+    if missing:
+        issues.append(f"missing {len(missing)} placeholder(s)")
+    unknown = found - expected - set(literal)
+    if unknown:
+        issues.append(f"unknown placeholder(s) {sorted(unknown)}")
+    return issues
+
+
+def check_script(output: str, target_language: str) -> list:
+    counts = script_counts(PLACEHOLDER_RE.sub("", output))
+    letters = sum(counts[s] for s in LETTER_SCRIPTS)
+    if letters < SCRIPT_MIN_LETTERS:
+        return []
+    expected = TARGET_SCRIPTS.get(target_language, DEFAULT_TARGET_SCRIPTS)
+    share = sum(counts[s] for s in expected) / letters
+    if share < SCRIPT_MIN_SHARE:
+        return [f"only {share:.0%} of letters in {target_language} script"]
+    return []
+
+
+def check_length(source: str, output: str, source_language: str, target_language: str) -> list:
+    source_tokens = estimate_tokens(PLACEHOLDER_RE.sub("", source))
+    output_tokens = estimate_tokens(PLACEHOLDER_RE.sub("", output))
+    expected = (
+        LANGUAGE_TOKEN_DENSITY.get(target_language, 1.0)
+        / LANGUAGE_TOKEN_DENSITY.get(source_language, 1.0)
+    )
+    ratio = output_tokens / max(source_tokens, 1) / expected
+    if ratio > LENGTH_RATIO_MAX and output_tokens > LENGTH_MIN_SOURCE_TOKENS:
+        return [f"output {ratio:.1f}x longer than expected"]
+    if ratio < LENGTH_RATIO_MIN and source_tokens >= LENGTH_MIN_SOURCE_TOKENS:
+        return [f"output {ratio:.2f}x of expected length (truncated?)"]
+    return []
+
+
+def check_output(
+    source: str,
+    output: str,
+    source_language: str,
+    target_language: str,
+    placeholders=None,
+) -> list:
+    """
+    단계 입력(source) 대비 출력 검증 → 문제 목록
+    - source_language == target_language 이면 편집 단계 (예상 길이 비율 1.0)
+    - placeholders: apply_placeholders 매핑 토큰 (None이면 source에 있는 토큰)
+    """
+    if not output.strip():
+        return ["empty output"] if source.strip() else []
+
+    in_source = find_placeholders(source)
+    if placeholders is None:
+        placeholders = in_source
+    else:
+        # 이 입력에 실제로 들어 있는 토큰만 (청크/묶음 일부, 앞 단계에서 변형된 모양 포함)
+        placeholders = [token for token in placeholders if token in in_source]
+
+    issues = check_placeholders(output, placeholders, in_source - set(placeholders))
+    # 편집 단계인데 입력부터 대상 문자가 아니면 (번역 단계에서 이미 보고됨) 문자 검사 생략
+    if source_language != target_language or not check_script(source, target_language):
+        issues += check_script(output, target_language)
+    return issues + check_length(source, output, source_language, target_language)